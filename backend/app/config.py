@@ -9,6 +9,10 @@ class Settings(BaseSettings):
     app_env: str = "dev"
 
     database_url: str = Field(default="sqlite:///./app.db")
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: int = 30
+    db_pool_recycle_seconds: int = 1800
     cors_origins: list[str] = Field(default_factory=lambda: [
         "http://localhost:3000",
         "http://127.0.0.1:3000",
@@ -19,8 +23,11 @@ class Settings(BaseSettings):
 
     scheduler_interval_minutes: int = 60
     scheduler_poll_seconds: int = 15
+    # 0 = auto: one worker on SQLite (single writer), four otherwise.
+    scheduler_max_workers: int = 0
 
     default_search_limit: int = 50
+    session_touch_throttle_seconds: int = 30
 
     llm_enabled: bool = True
     llm_provider: str = "google_gemini"
@@ -6,6 +6,7 @@ from pathlib import Path
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.config import settings
 
@@ -21,10 +22,27 @@ def _resolve_database_url() -> str:
     return configured or "sqlite:///./app.db"
 
 
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") in {"sqlite:", "sqlite+pysqlite:"}):
+        # In-memory SQLite lives inside one connection: share it across threads instead of pooling.
+        return {"poolclass": StaticPool}
+
+    options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+    }
+    if not url.startswith("sqlite"):
+        # Networked databases: drop stale connections before handing them out.
+        options["pool_pre_ping"] = True
+        options["pool_recycle"] = settings.db_pool_recycle_seconds
+    return options
+
+
 database_url = _resolve_database_url()
 is_sqlite = database_url.startswith("sqlite")
 connect_args = {"check_same_thread": False, "timeout": 30} if is_sqlite else {}
-engine = create_engine(database_url, future=True, connect_args=connect_args)
+engine = create_engine(database_url, future=True, connect_args=connect_args, **_engine_options(database_url))
 
 
 def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
@@ -49,7 +67,9 @@ def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
 if is_sqlite:
     event.listen(engine, "connect", _set_sqlite_pragmas)
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+# Keep attributes loaded after commit: callers read back what they just wrote, so expiring
+# would only force a redundant SELECT per mutated row.
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True)
 Base = declarative_base()
 
 
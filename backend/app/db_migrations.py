@@ -39,6 +39,8 @@ _TABLE_COLUMNS: dict[str, list[tuple[str, str]]] = {
 _INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_search_results_search_final_score ON search_results (search_config_id, final_score DESC)",
     "CREATE INDEX IF NOT EXISTS idx_search_results_search_discovered ON search_results (search_config_id, discovered_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_search_results_job_posting ON search_results (job_posting_id)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_cv_created ON sessions (cv_id, created_at DESC)",
     "CREATE INDEX IF NOT EXISTS idx_job_postings_category ON job_postings (job_category, job_subcategory)",
 ]
 
@@ -44,13 +44,13 @@ class CVDocument(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
 
     profiles: Mapped[list[CandidateProfile]] = relationship(
-        "CandidateProfile", back_populates="cv", cascade="all, delete-orphan"
+        "CandidateProfile", back_populates="cv", cascade="all, delete-orphan", passive_deletes=True
     )
     searches: Mapped[list[SearchConfig]] = relationship(
-        "SearchConfig", back_populates="cv", cascade="all, delete-orphan"
+        "SearchConfig", back_populates="cv", cascade="all, delete-orphan", passive_deletes=True
     )
     sessions: Mapped[list[CVSession]] = relationship(
-        "CVSession", back_populates="cv", cascade="all, delete-orphan"
+        "CVSession", back_populates="cv", cascade="all, delete-orphan", passive_deletes=True
     )
 
 
@@ -103,10 +103,10 @@ class SearchConfig(Base):
 
     cv: Mapped[CVDocument] = relationship("CVDocument", back_populates="searches")
     runs: Mapped[list[SchedulerRun]] = relationship(
-        "SchedulerRun", back_populates="search", cascade="all, delete-orphan"
+        "SchedulerRun", back_populates="search", cascade="all, delete-orphan", passive_deletes=True
     )
     results: Mapped[list[SearchResult]] = relationship(
-        "SearchResult", back_populates="search", cascade="all, delete-orphan"
+        "SearchResult", back_populates="search", cascade="all, delete-orphan", passive_deletes=True
     )
     active_sessions: Mapped[list[CVSession]] = relationship("CVSession", back_populates="active_search")
     interactions: Mapped[list[Interaction]] = relationship(
@@ -146,6 +146,7 @@ class CVSession(Base):
     __table_args__ = (
         Index("idx_sessions_cv_last_seen", "cv_id", "last_seen_at"),
         Index("idx_sessions_status_last_seen", "status", "last_seen_at"),
+        Index("idx_sessions_cv_created", "cv_id", "created_at"),
     )
 
 
@@ -239,13 +240,14 @@ class SearchResult(Base):
     search: Mapped[SearchConfig] = relationship("SearchConfig", back_populates="results")
     job: Mapped[JobPosting] = relationship("JobPosting", back_populates="results")
     check: Mapped[ResultCheck | None] = relationship(
-        "ResultCheck", back_populates="result", cascade="all, delete-orphan", uselist=False
+        "ResultCheck", back_populates="result", cascade="all, delete-orphan", uselist=False, passive_deletes=True
     )
 
     __table_args__ = (
         UniqueConstraint("search_config_id", "job_posting_id", name="uq_search_result_job"),
         Index("idx_search_results_search_final_score", "search_config_id", "final_score"),
         Index("idx_search_results_search_discovered", "search_config_id", "discovered_at"),
+        Index("idx_search_results_job_posting", "job_posting_id"),
     )
 
 
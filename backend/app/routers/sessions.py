@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app import models
 from app.db import get_db
@@ -45,12 +45,12 @@ def get_history(
     db: Session = Depends(get_db),
 ) -> SessionHistoryOut:
     sessions = list_sessions(db, limit=limit)
-    return SessionHistoryOut(items=[_to_session_out(item) for item in sessions])
+    return SessionHistoryOut(items=[_session_row_to_out(row) for row in sessions])
 
 
 @router.post("/resume", response_model=SessionOut)
 def resume(payload: SessionResumeIn, db: Session = Depends(get_db)) -> SessionOut:
-    target = db.get(models.CVSession, payload.session_id)
+    target = db.get(models.CVSession, payload.session_id, options=[joinedload(models.CVSession.cv)])
     if not target:
         raise HTTPException(status_code=404, detail="Session not found")
     _validate_search_for_session(db, target.cv_id, payload.active_search_id)
@@ -68,7 +68,7 @@ def resume(payload: SessionResumeIn, db: Session = Depends(get_db)) -> SessionOu
 
 @router.post("/state", response_model=SessionOut)
 def update_state(payload: SessionStateUpdateIn, db: Session = Depends(get_db)) -> SessionOut:
-    target = db.get(models.CVSession, payload.session_id)
+    target = db.get(models.CVSession, payload.session_id, options=[joinedload(models.CVSession.cv)])
     if not target:
         raise HTTPException(status_code=404, detail="Session not found")
     _validate_search_for_session(db, target.cv_id, payload.active_search_id)
@@ -132,6 +132,21 @@ def _to_session_out(session: models.CVSession) -> SessionOut:
     )
 
 
+def _session_row_to_out(row: dict) -> SessionOut:
+    return SessionOut(
+        session_id=row["id"],
+        cv_id=row["cv_id"],
+        cv_filename=row["cv_filename"],
+        candidate_name=_extract_candidate_name(row["cv_raw_text"] or ""),
+        active_search_id=row["active_search_id"],
+        ui_state=row["ui_state_json"] or {},
+        status=row["status"],
+        analysis_executed_at=row["analysis_executed_at"],
+        created_at=row["created_at"],
+        last_seen_at=row["last_seen_at"],
+    )
+
+
 def _extract_candidate_name(raw_text: str) -> str | None:
     for raw_line in (raw_text or "").splitlines():
         line = " ".join(raw_line.strip().split())
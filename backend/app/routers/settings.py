@@ -13,7 +13,8 @@ router = APIRouter(prefix="/settings", tags=["settings"])
 @router.get("/llm", response_model=LLMSettingsOut)
 def get_llm_settings(db: Session = Depends(get_db)) -> LLMSettingsOut:
     payload = get_llm_settings_public(db)
-    return LLMSettingsOut(**payload)
+    # runtime_settings already normalizes these fields, and response_model checks them on the way out.
+    return LLMSettingsOut.model_construct(**payload)
 
 
 @router.put("/llm", response_model=LLMSettingsOut)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class BoundedLRU(Generic[V]):
+    """Thread-safe LRU holding at most ``maxsize`` entries.
+
+    Values are copied with ``copy`` on the way in and out, so callers never share the cached object.
+    """
+
+    def __init__(self, maxsize: int, copy: Callable[[V], V]) -> None:
+        self._maxsize = maxsize
+        self._copy = copy
+        self._data: OrderedDict[Hashable, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                return None
+            self._data.move_to_end(key)
+        return self._copy(value)
+
+    def put(self, key: Hashable, value: V) -> None:
+        stored = self._copy(value)
+        with self._lock:
+            self._data[key] = stored
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
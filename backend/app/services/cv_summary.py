@@ -172,6 +172,19 @@ SECTION_KEYWORDS = {
     },
 }
 
+# Compiled once at import instead of rebuilding a pattern per keyword on every call.
+_SKILL_PATTERNS = [(skill, re.compile(rf"\b{re.escape(skill)}\b")) for skill in sorted(KNOWN_SKILLS)]
+_LANG_PATTERNS = [(re.compile(rf"\b{re.escape(token)}\b"), display) for token, display in LANG_HINTS.items()]
+_SECTION_SUFFIX_RE = re.compile(r"[:\-]+$")
+_WHITESPACE_RE = re.compile(r"\s+")
+_SKILL_SPLIT_RE = re.compile(r"[,;|/]")
+_SKILL_PREFIX_RE = re.compile(r"^(habilidades|competencias|skills?)\s*:?\s*", re.IGNORECASE)
+_DATE_RANGE_RE = re.compile(
+    r"\b(?:19|20)\d{2}\b"
+    r"|\b(?:ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic|jan|apr|aug|dec)\b"
+    r"|\b(?:actual|present|hoy)\b"
+)
+
 
 def summarize_cv_text(text: str) -> dict:
     cleaned_lines = _clean_lines(text)
@@ -242,17 +255,16 @@ def _detect_section(line: str) -> str | None:
 
 def _normalize_for_section(line: str) -> str:
     lower = line.lower().strip()
-    lower = re.sub(r"[:\-]+$", "", lower)
-    lower = re.sub(r"\s+", " ", lower)
+    lower = _SECTION_SUFFIX_RE.sub("", lower)
+    lower = _WHITESPACE_RE.sub(" ", lower)
     return lower
 
 
 def _extract_skills(text_lower: str, sections: dict[str, list[str]]) -> list[str]:
     found: list[str] = []
 
-    for skill in sorted(KNOWN_SKILLS):
-        pattern = rf"\b{re.escape(skill)}\b"
-        if re.search(pattern, text_lower):
+    for skill, pattern in _SKILL_PATTERNS:
+        if pattern.search(text_lower):
             found.append(skill)
 
     section_text = " ; ".join(sections.get("skills", []) + sections.get("training", []))
@@ -266,11 +278,11 @@ def _extract_skills(text_lower: str, sections: dict[str, list[str]]) -> list[str
 def _split_skill_tokens(text: str) -> list[str]:
     if not text:
         return []
-    chunks = re.split(r"[,;|/]", text)
+    chunks = _SKILL_SPLIT_RE.split(text)
     out: list[str] = []
     for chunk in chunks:
         cleaned = " ".join(chunk.strip().split())
-        cleaned = re.sub(r"^(habilidades|competencias|skills?)\s*:?\s*", "", cleaned, flags=re.IGNORECASE)
+        cleaned = _SKILL_PREFIX_RE.sub("", cleaned)
         if cleaned:
             out.append(cleaned.lower())
     return out
@@ -318,8 +330,8 @@ def _extract_languages(text_lower: str, sections: dict[str, list[str]]) -> list[
     out: list[str] = []
 
     lang_text = text_lower + " " + " ".join(sections.get("languages", [])).lower()
-    for token, display in LANG_HINTS.items():
-        if re.search(rf"\b{re.escape(token)}\b", lang_text):
+    for pattern, display in _LANG_PATTERNS:
+        if pattern.search(lang_text):
             out.append(display)
     return _dedupe(out)
 
@@ -343,13 +355,7 @@ def _build_highlights(
 
 
 def _looks_like_date_range(text: str) -> bool:
-    if re.search(r"\b(19|20)\d{2}\b", text):
-        return True
-    if re.search(r"\b(?:ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic|jan|apr|aug|dec)\b", text):
-        return True
-    if re.search(r"\b(?:actual|present|hoy)\b", text):
-        return True
-    return False
+    return _DATE_RANGE_RE.search(text) is not None
 
 
 def _dedupe(values: list[str]) -> list[str]:
@@ -51,6 +51,8 @@ _SOURCES: dict[str, SourceSpec] = {
         status_note="No disponible por ahora: acceso automatizado bloqueado sin integración oficial.",
     ),
 }
+# Built once from the registry; normalization is a set-membership filter.
+_ENABLED_SOURCES = frozenset(source_id for source_id, spec in _SOURCES.items() if spec.enabled)
 
 
 def list_allowed_sources() -> list[SourceSpec]:
@@ -65,22 +67,9 @@ def list_allowed_sources() -> list[SourceSpec]:
 
 
 def normalize_sources(sources: list[str] | None) -> list[str]:
-    requested = [str(source).strip() for source in (sources or []) if str(source).strip()]
-    normalized: list[str] = []
-    seen: set[str] = set()
-
-    for source in requested:
-        spec = _SOURCES.get(source)
-        if not spec or not spec.enabled:
-            continue
-        if source in seen:
-            continue
-        seen.add(source)
-        normalized.append(source)
-
-    if not normalized:
-        normalized.append(DEFAULT_SOURCE)
-    return normalized
+    # dict.fromkeys drops repeats while keeping the first-seen order.
+    requested = dict.fromkeys(str(source).strip() for source in (sources or []))
+    return [source for source in requested if source in _ENABLED_SOURCES] or [DEFAULT_SOURCE]
 
 
 def fetch_jobs(
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import re
 
-_EMAIL_RE = re.compile(r"\b[\w.%+-]+@[\w.-]+\.[A-Za-z]{2,}\b")
-_PHONE_RE = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
-_URL_RE = re.compile(r"\b(?:https?://|www\.)\S+\b", re.IGNORECASE)
+# One alternation, one pass: the matching group name is the placeholder ([EMAIL], [PHONE], [URL]).
+_PII_RE = re.compile(
+    r"(?P<EMAIL>\b[\w.%+-]+@[\w.-]+\.[A-Za-z]{2,}\b)"
+    r"|(?P<PHONE>\+?\d[\d\s().-]{7,}\d)"
+    r"|(?P<URL>\b(?i:https?://|www\.)\S+\b)"
+)
 _NAME_LINE_RE = re.compile(r"^[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúñ'`.-]+(?:\s+[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúñ'`.-]+){1,3}$")
 
 
@@ -12,9 +15,7 @@ def redact_pii(text: str) -> str:
     if not text:
         return ""
 
-    redacted = _EMAIL_RE.sub("[EMAIL]", text)
-    redacted = _PHONE_RE.sub("[PHONE]", redacted)
-    redacted = _URL_RE.sub("[URL]", redacted)
+    redacted = _PII_RE.sub(_placeholder, text)
 
     lines = redacted.splitlines()
     for idx, line in enumerate(lines[:3]):
@@ -23,3 +24,7 @@ def redact_pii(text: str) -> str:
             lines[idx] = "[NAME]"
 
     return "\n".join(lines)
+
+
+def _placeholder(match: re.Match) -> str:
+    return f"[{match.lastgroup}]"
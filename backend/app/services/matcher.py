@@ -22,12 +22,27 @@ SKILL_TOKENS = {
     "django",
 }
 
+_TOKEN_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9\+\.#-]{2,}")
+
 
 def compute_match(profile: dict, job: dict) -> tuple[float, dict]:
+    return compute_match_batch(profile, [job])[0]
+
+
+def compute_match_batch(profile: dict, jobs: list[dict]) -> list[tuple[float, dict]]:
+    # The CV side is tokenized once and reused for every job in the batch.
     profile_skills = _tokenize(profile.get("skills", []))
     profile_experience = _tokenize(profile.get("experience", []))
     profile_education = _tokenize(profile.get("education", []))
+    return [_score_job(profile_skills, profile_experience, profile_education, job) for job in jobs]
+
 
+def _score_job(
+    profile_skills: set[str],
+    profile_experience: set[str],
+    profile_education: set[str],
+    job: dict,
+) -> tuple[float, dict]:
     job_title_desc = f"{job.get('title', '')} {job.get('description', '')}".lower()
     job_tokens = _tokenize([job_title_desc])
     job_skill_tokens = {token for token in SKILL_TOKENS if token in job_title_desc}
@@ -52,8 +67,7 @@ def compute_match(profile: dict, job: dict) -> tuple[float, dict]:
 def _tokenize(values: list[str]) -> set[str]:
     tokens: set[str] = set()
     for value in values:
-        for token in re.findall(r"[a-zA-Z][a-zA-Z0-9\+\.#-]{2,}", value.lower()):
-            tokens.add(token)
+        tokens.update(_TOKEN_RE.findall(value.lower()))
     return tokens
 
 
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
 import re
 from typing import Any
 
+from app.services.bounded_cache import BoundedLRU
 from app.services.llm import LLMClientError, get_llm_client
 from app.services.llm.pii import redact_pii
 from app.services.llm.prompts import build_profile_prompt
 from app.services.llm.schemas import LLMCVExtraction
+from app.services.role_keywords import ACADEMIC_EDUCATION_RX, ACADEMIC_ROLE_RX, HR_RX
 from app.services.runtime_settings import load_runtime_llm_config
 
+_ROLE_TOKEN_RX = re.compile(
+    "engineer|developer|analyst|scientist|manager|consultant|architect|specialist"
+    "|administrador|administradora|coordinador|coordinadora|jefe|direct|encargad|publico|publica"
+    "|academico|academica|docente|profesor|profesora|instructor|relator"
+    "|rrhh|recursos humanos|human resources|talento humano|gestion de personas|people operations"
+    "|reclutamiento|seleccion"
+)
+
 
 def analyze_profile(raw_text: str, summary: dict[str, Any]) -> dict[str, Any]:
     normalized_summary = _normalize_summary(summary)
@@ -20,7 +31,7 @@ def analyze_profile(raw_text: str, summary: dict[str, Any]) -> dict[str, Any]:
     runtime_cfg = load_runtime_llm_config()
     client = get_llm_client()
     if not client.enabled:
-        return _fallback_bundle(
+        return _cached_fallback_bundle(
             normalized_summary,
             fingerprint=fingerprint,
             error=f"LLM disabled or missing {runtime_cfg.provider} configuration",
@@ -89,6 +100,28 @@ def analyze_profile(raw_text: str, summary: dict[str, Any]) -> dict[str, Any]:
         return _fallback_bundle(normalized_summary, fingerprint=fingerprint, error=str(exc), prompt_version=runtime_cfg.prompt_version)
 
 
+# Without an LLM the bundle is a pure function of the normalized summary, which the fingerprint
+# covers. Deep copies: callers store and mutate the nested lists.
+_fallback_cache: BoundedLRU[dict[str, Any]] = BoundedLRU(512, copy.deepcopy)
+
+
+def _cached_fallback_bundle(
+    summary: dict[str, Any],
+    *,
+    fingerprint: str,
+    error: str,
+    prompt_version: str,
+) -> dict[str, Any]:
+    key = (fingerprint, error, prompt_version)
+    cached = _fallback_cache.get(key)
+    if cached is not None:
+        return cached
+
+    bundle = _fallback_bundle(summary, fingerprint=fingerprint, error=error, prompt_version=prompt_version)
+    _fallback_cache.put(key, bundle)
+    return bundle
+
+
 def _fallback_bundle(
     summary: dict[str, Any],
     *,
@@ -179,46 +212,12 @@ def _clean_list(values: Any) -> list[str]:
 
 
 def _profile_fingerprint(summary: dict[str, Any]) -> str:
-    payload = json.dumps(summary, sort_keys=True, ensure_ascii=True)
+    payload = json.dumps(summary, sort_keys=True, separators=(",", ":"))
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 def _infer_roles(summary: dict[str, Any]) -> list[str]:
     seeds = summary.get("experience", []) + summary.get("highlights", []) + summary.get("education", [])
-    role_tokens = [
-        "engineer",
-        "developer",
-        "analyst",
-        "scientist",
-        "manager",
-        "consultant",
-        "architect",
-        "specialist",
-        "administrador",
-        "administradora",
-        "coordinador",
-        "coordinadora",
-        "jefe",
-        "direct",
-        "encargad",
-        "publico",
-        "publica",
-        "academico",
-        "academica",
-        "docente",
-        "profesor",
-        "profesora",
-        "instructor",
-        "relator",
-        "rrhh",
-        "recursos humanos",
-        "human resources",
-        "talento humano",
-        "gestion de personas",
-        "people operations",
-        "reclutamiento",
-        "seleccion",
-    ]
 
     roles: list[str] = []
     has_public_admin = False
@@ -242,38 +241,16 @@ def _infer_roles(summary: dict[str, Any]) -> list[str]:
             if not _is_valid_role_phrase(candidate):
                 continue
 
-            if any(token in low for token in role_tokens):
-                roles.append(candidate)
-
             if "administrador publico" in low or "administrador público" in low:
                 has_public_admin = True
 
-            if any(
-                token in low
-                for token in [
-                    "academico",
-                    "academica",
-                    "docente",
-                    "profesor",
-                    "profesora",
-                    "instructor",
-                    "relator",
-                ]
-            ):
+            # Academic and HR tokens are a subset of the role tokens, so a miss here rules them out too.
+            if not _ROLE_TOKEN_RX.search(low):
+                continue
+            roles.append(candidate)
+            if ACADEMIC_ROLE_RX.search(low):
                 has_academic = True
-
-            if any(
-                token in low
-                for token in [
-                    "rrhh",
-                    "recursos humanos",
-                    "human resources",
-                    "talento humano",
-                    "gestion de personas",
-                    "reclutamiento",
-                    "seleccion",
-                ]
-            ):
+            if HR_RX.search(low):
                 has_hr = True
 
     priority_roles: list[str] = []
@@ -442,18 +419,7 @@ def _extract_education_queries(education_lines: list[str]) -> list[str]:
                 ]
             )
 
-        if any(
-            token in low
-            for token in [
-                "rrhh",
-                "recursos humanos",
-                "human resources",
-                "talento humano",
-                "gestion de personas",
-                "reclutamiento",
-                "seleccion",
-            ]
-        ):
+        if HR_RX.search(low):
             out.extend(
                 [
                     "Recursos Humanos",
@@ -463,19 +429,7 @@ def _extract_education_queries(education_lines: list[str]) -> list[str]:
                 ]
             )
 
-        if any(
-            token in low
-            for token in [
-                "academ",
-                "docencia",
-                "docente",
-                "profesor",
-                "profesora",
-                "relator",
-                "capacitacion",
-                "capacitación",
-            ]
-        ):
+        if ACADEMIC_EDUCATION_RX.search(low):
             out.extend(
                 [
                     "Academico",
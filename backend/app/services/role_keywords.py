@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import re
+
+# Shared by the profile and search role inferrers; substring alternations, one scan per line.
+HR_RX = re.compile(
+    "rrhh|recursos humanos|human resources|talento humano|gestion de personas|reclutamiento|seleccion"
+)
+ACADEMIC_ROLE_RX = re.compile("academico|academica|docente|profesor|profesora|instructor|relator")
+ACADEMIC_EDUCATION_RX = re.compile(
+    "academ|docencia|docente|profesor|profesora|relator|capacitacion|capacitación"
+)
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+import hashlib
+from itertools import chain, islice
+import json
+import logging
 import re
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, case, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, sessionmaker
 
 from app import models
+from app.config import settings
+from app.services.bounded_cache import BoundedLRU
 from app.services.job_ai_service import compute_job_content_hash, evaluate_job_fit
 from app.services.job_sources import fetch_jobs, normalize_sources
 from app.services.linkedin_scraper import scrape_jobs as scrape_linkedin_jobs
 from app.services.learning_service import personalization_score_for_job, preferred_query_seeds
-from app.services.matcher import compute_match
+from app.services.matcher import compute_match_batch
+from app.services.role_keywords import ACADEMIC_EDUCATION_RX, ACADEMIC_ROLE_RX, HR_RX
 from app.services.runtime_settings import load_runtime_llm_config
 
+logger = logging.getLogger(__name__)
+
 # Backward-compatible alias used by tests that monkeypatch this symbol.
 scrape_jobs = scrape_linkedin_jobs
 
@@ -55,6 +66,7 @@ def run_search_once(session_factory: sessionmaker, search_id: str, run_type: str
             raise ValueError("profile not found for cv")
 
         profile_summary = _profile_summary(profile)
+        profile_hash = _profile_hash(profile_summary)
         profile_analysis = _profile_analysis(profile)
         learned_preferences = profile.learned_preferences_json or {}
         runtime_cfg = load_runtime_llm_config(db)
@@ -72,6 +84,8 @@ def run_search_once(session_factory: sessionmaker, search_id: str, run_type: str
         search_id_local = search.id
         search_city = search.city
         search_country = search.country
+        city_low = (search_city or "").lower().strip()
+        country_low = (search_country or "").lower().strip()
         effective_time_window_hours = 1 if run_type == "scheduled" else search.time_window_hours
         search_sources = normalize_sources(search.sources_json or [])
         if search.sources_json != search_sources:
@@ -81,12 +95,11 @@ def run_search_once(session_factory: sessionmaker, search_id: str, run_type: str
         run_id = run.id
         run_started_at = run.started_at
 
-        existing_results = db.scalars(
-            select(models.SearchResult).where(models.SearchResult.search_config_id == search_id_local)
-        ).all()
-        for result in existing_results:
-            result.is_new = False
-            db.add(result)
+        db.execute(
+            update(models.SearchResult)
+            .where(models.SearchResult.search_config_id == search_id_local)
+            .values(is_new=False)
+        )
         db.commit()
 
         location_parts = [p for p in [search_city, search_country] if p]
@@ -99,6 +112,8 @@ def run_search_once(session_factory: sessionmaker, search_id: str, run_type: str
             learned_preferences=learned_preferences,
         )
         scraped_jobs: dict[str, dict] = {}
+        # Rank duplicates by (has applicant count, description length) and keep the best one.
+        scraped_scores: dict[str, tuple[int, int]] = {}
         for query in queries:
             for source_id in search_sources:
                 if source_id == "linkedin_public":
@@ -123,31 +138,37 @@ def run_search_once(session_factory: sessionmaker, search_id: str, run_type: str
                     key = _dedupe_key(job)
                     if not key:
                         continue
-                    existing = scraped_jobs.get(key)
-                    if not existing:
-                        scraped_jobs[key] = job
-                        continue
-
-                    if int(existing.get("applicant_count") or 0) == 0 and int(job.get("applicant_count") or 0) > 0:
-                        scraped_jobs[key] = job
-                        continue
-                    if len((job.get("description") or "")) > len((existing.get("description") or "")):
+                    score = (
+                        1 if int(job.get("applicant_count") or 0) > 0 else 0,
+                        len(job.get("description") or ""),
+                    )
+                    if key not in scraped_scores or score > scraped_scores[key]:
                         scraped_jobs[key] = job
+                        scraped_scores[key] = score
 
         new_found = 0
-        eligible_found = 0
         llm_budget = max(int(runtime_cfg.max_jobs_per_run), 0)
+        # One timestamp per batch keeps last_seen_at and recency consistent across jobs.
+        now = datetime.utcnow()
 
+        eligible: list[tuple[models.JobPosting, dict]] = []
         for job in scraped_jobs.values():
-            posting = _upsert_posting(db, job)
+            posting = _upsert_posting(db, job, now=now)
             if (posting.applicant_count or 0) >= 100:
                 # Exclude crowded offers by product rule.
-                db.commit()
                 continue
+            eligible.append((posting, _job_payload(posting)))
+        db.commit()
 
-            eligible_found += 1
-            score, breakdown = compute_match(profile_summary, job)
+        eligible_found = len(eligible)
+        # Deterministic scores for the whole batch up front, so the CV is tokenized once per run.
+        matches = _cached_matches(
+            profile_hash,
+            profile_summary,
+            [(job_payload, posting.job_content_hash) for posting, job_payload in eligible],
+        )
 
+        for (posting, job_payload), (score, breakdown) in zip(eligible, matches):
             result = db.scalar(
                 select(models.SearchResult).where(
                     models.SearchResult.search_config_id == search_id_local,
@@ -156,7 +177,6 @@ def run_search_once(session_factory: sessionmaker, search_id: str, run_type: str
             )
 
             posting_id = posting.id
-            job_payload = _job_payload(posting)
 
             should_run_llm = False
             if llm_budget > 0:
@@ -209,11 +229,6 @@ def run_search_once(session_factory: sessionmaker, search_id: str, run_type: str
                 llm_status=ai.get("llm_status"),
             )
 
-            posting = db.get(models.JobPosting, posting_id)
-            if posting is None:
-                posting = _upsert_posting(db, job)
-                posting_id = posting.id
-
             result = db.scalar(
                 select(models.SearchResult).where(
                     models.SearchResult.search_config_id == search_id_local,
@@ -227,8 +242,8 @@ def run_search_once(session_factory: sessionmaker, search_id: str, run_type: str
                 posting.job_subcategory = ai.get("job_subcategory")
             db.add(posting)
 
-            recency_score = _recency_score(posting.posted_at)
-            location_score = _location_score(posting.location, posting.modality, search_city, search_country)
+            recency_score = _recency_score(posting.posted_at, now=now)
+            location_score = _location_score(posting.location, posting.modality, city_low, country_low)
             personalization_score = personalization_score_for_job(posting, learned_preferences)
             final_score = _final_score(
                 deterministic_score=score,
@@ -309,15 +324,35 @@ def run_all_active_searches(session_factory: sessionmaker) -> list[dict]:
             ).all()
         ]
 
-    for search_id in active_search_ids:
-        try:
-            out.append(run_search_once(session_factory, search_id, run_type="scheduled"))
-        except Exception:
-            continue
+    if not active_search_ids:
+        return out
+
+    # Each run opens its own session, so independent searches can scrape/score concurrently.
+    max_workers = max(1, min(_scheduler_max_workers(session_factory), len(active_search_ids)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-run") as executor:
+        futures = {
+            executor.submit(run_search_once, session_factory, search_id, "scheduled"): search_id
+            for search_id in active_search_ids
+        }
+        for future in as_completed(futures):
+            try:
+                out.append(future.result())
+            except Exception:
+                logger.exception("scheduled search run failed for search %s", futures[future])
+                continue
 
     return out
 
 
+def _scheduler_max_workers(session_factory: sessionmaker) -> int:
+    configured = int(settings.scheduler_max_workers)
+    if configured > 0:
+        return configured
+    # SQLite allows one writer at a time; concurrent runs would mostly wait on each other's locks.
+    bind = session_factory.kw.get("bind")
+    return 1 if bind is not None and bind.dialect.name == "sqlite" else 4
+
+
 def _profile_summary(profile: models.CandidateProfile) -> dict:
     summary = profile.summary_json or {
         "skills": profile.skills_json or [],
@@ -335,6 +370,48 @@ def _profile_summary(profile: models.CandidateProfile) -> dict:
     }
 
 
+def _profile_hash(profile_summary: dict) -> str:
+    payload = json.dumps(profile_summary, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _copy_match(match: tuple[float, dict]) -> tuple[float, dict]:
+    # The breakdown and its matched_skills list are copied; the other values are immutable.
+    score, breakdown = match
+    return score, {key: list(value) if isinstance(value, list) else value for key, value in breakdown.items()}
+
+
+_match_cache: BoundedLRU[tuple[float, dict]] = BoundedLRU(4096, _copy_match)
+
+
+def _cached_matches(
+    profile_hash: str,
+    profile_summary: dict,
+    jobs: list[tuple[dict, str | None]],
+) -> list[tuple[float, dict]]:
+    # compute_match is pure over (profile, title/description); the content hash covers both,
+    # so the same (profile, posting) pair is scored once across runs. Misses are scored in one batch.
+    matches: list[tuple[float, dict] | None] = [None] * len(jobs)
+    misses: list[int] = []
+    for index, (_, content_hash) in enumerate(jobs):
+        cached = _match_cache.get((profile_hash, content_hash)) if content_hash else None
+        if cached is None:
+            misses.append(index)
+            continue
+        matches[index] = cached
+
+    if not misses:
+        return matches
+
+    computed = compute_match_batch(profile_summary, [jobs[index][0] for index in misses])
+    for index, value in zip(misses, computed):
+        matches[index] = value
+        content_hash = jobs[index][1]
+        if content_hash:
+            _match_cache.put((profile_hash, content_hash), value)
+    return matches
+
+
 def _profile_analysis(profile: models.CandidateProfile) -> dict:
     llm_profile = profile.llm_profile_json or {}
     llm_strategy = profile.llm_strategy_json or {}
@@ -366,37 +443,38 @@ def _build_queries(
     education_focus = _extract_education_focus(education)
     learned_queries = preferred_query_seeds(learned_preferences, limit=8)
 
-    seeds: list[str] = []
-    # Highest priority: explicit strategy from profile analysis.
-    seeds.extend([s for s in strategy_queries[:12] if isinstance(s, str)])
-
-    # Learned preferences from interaction history.
-    seeds.extend([s for s in learned_queries if isinstance(s, str)])
-
-    # Then professional trajectory and academic formation.
-    seeds.extend(role_phrases[:10])
-    seeds.extend(education_focus[:8])
-
-    # Keep legacy fallback signals.
-    seeds.extend([s for s in experience[:6] if isinstance(s, str)])
-    seeds.extend([s for s in skills[:10] if isinstance(s, str)])
-    seeds.extend([s for s in education[:6] if isinstance(s, str)])
-    seeds.extend([s for s in extra_keywords[:10] if isinstance(s, str)])
-
-    normalized = []
-    for value in seeds:
-        cleaned = " ".join(value.split())
-        if cleaned:
-            normalized.append(cleaned)
+    # Ordered by priority; islice/chain lets the loop below stop as soon as 20 seeds are collected.
+    seeds = chain(
+        # Highest priority: explicit strategy from profile analysis.
+        islice(strategy_queries, 12),
+        # Learned preferences from interaction history.
+        learned_queries,
+        # Then professional trajectory and academic formation.
+        islice(role_phrases, 10),
+        islice(education_focus, 8),
+        # Keep legacy fallback signals.
+        islice(experience, 6),
+        islice(skills, 10),
+        islice(education, 6),
+        islice(extra_keywords, 10),
+    )
 
+    # Single pass: drop non-strings, normalize whitespace, dedupe case-insensitively.
     deduped: list[str] = []
     seen: set[str] = set()
-    for value in normalized:
-        key = value.lower()
+    for value in seeds:
+        if not isinstance(value, str):
+            continue
+        cleaned = " ".join(value.split())
+        if not cleaned:
+            continue
+        key = cleaned.lower()
         if key in seen:
             continue
         seen.add(key)
-        deduped.append(value)
+        deduped.append(cleaned)
+        if len(deduped) >= 20:
+            break
 
     if not deduped:
         deduped.append("software engineer")
@@ -427,25 +505,15 @@ def _extract_role_phrases(lines: list[str]) -> list[str]:
             out.append(base)
 
         # Common separators in job lines.
-        for sep in [" at ", " en ", " - ", " | "]:
-            if sep in low:
-                part = cleaned[: low.index(sep)].strip(" -|,;")
+        for sep in (" at ", " en ", " - ", " | "):
+            idx = low.find(sep)
+            if idx >= 0:
+                part = cleaned[:idx].strip(" -|,;")
                 if 3 <= len(part) <= 90:
                     out.append(part)
                 break
 
-        if any(
-            token in low
-            for token in [
-                "rrhh",
-                "recursos humanos",
-                "human resources",
-                "talento humano",
-                "gestion de personas",
-                "reclutamiento",
-                "seleccion",
-            ]
-        ):
+        if HR_RX.search(low):
             out.extend(
                 [
                     "Recursos Humanos",
@@ -454,18 +522,7 @@ def _extract_role_phrases(lines: list[str]) -> list[str]:
                 ]
             )
 
-        if any(
-            token in low
-            for token in [
-                "academico",
-                "academica",
-                "docente",
-                "profesor",
-                "profesora",
-                "instructor",
-                "relator",
-            ]
-        ):
+        if ACADEMIC_ROLE_RX.search(low):
             out.extend(
                 [
                     "Academico",
@@ -499,18 +556,7 @@ def _extract_education_focus(education_lines: list[str]) -> list[str]:
                 "Municipal",
             ])
 
-        if any(
-            token in low
-            for token in [
-                "rrhh",
-                "recursos humanos",
-                "human resources",
-                "talento humano",
-                "gestion de personas",
-                "reclutamiento",
-                "seleccion",
-            ]
-        ):
+        if HR_RX.search(low):
             out.extend(
                 [
                     "Recursos Humanos",
@@ -520,19 +566,7 @@ def _extract_education_focus(education_lines: list[str]) -> list[str]:
                 ]
             )
 
-        if any(
-            token in low
-            for token in [
-                "academ",
-                "docencia",
-                "docente",
-                "profesor",
-                "profesora",
-                "relator",
-                "capacitacion",
-                "capacitación",
-            ]
-        ):
+        if ACADEMIC_EDUCATION_RX.search(low):
             out.extend(
                 [
                     "Academico",
@@ -551,16 +585,13 @@ def _extract_education_focus(education_lines: list[str]) -> list[str]:
 
 
 def _dedupe_queries(values: list[str]) -> list[str]:
-    seen: set[str] = set()
-    out: list[str] = []
+    # Insertion-ordered dict keyed by lowercase form keeps the first spelling seen.
+    deduped: dict[str, str] = {}
     for value in values:
         cleaned = " ".join(value.split())
-        key = cleaned.lower()
-        if not cleaned or key in seen:
-            continue
-        seen.add(key)
-        out.append(cleaned)
-    return out
+        if cleaned:
+            deduped.setdefault(cleaned.lower(), cleaned)
+    return list(deduped.values())
 
 
 def _dedupe_key(job: dict) -> str | None:
@@ -576,28 +607,17 @@ def _dedupe_key(job: dict) -> str | None:
     return None
 
 
-def _upsert_posting(db: Session, job: dict) -> models.JobPosting:
+_CONTENT_HASH_FIELDS = ("title", "company", "location", "description", "modality")
+
+
+def _upsert_posting(db: Session, job: dict, *, now: datetime | None = None) -> models.JobPosting:
     source = (job.get("source") or "linkedin_public").strip() or "linkedin_public"
     external_job_id = (job.get("external_job_id") or "").strip() or None
     canonical_hash = (job.get("canonical_url_hash") or "").strip()
 
-    posting = None
-    if external_job_id:
-        posting = db.scalar(
-            select(models.JobPosting).where(
-                and_(
-                    models.JobPosting.source == source,
-                    models.JobPosting.external_job_id == external_job_id,
-                )
-            )
-        )
-
-    if not posting and canonical_hash:
-        posting = db.scalar(
-            select(models.JobPosting).where(models.JobPosting.canonical_url_hash == canonical_hash)
-        )
+    posting = _find_posting(db, source=source, external_job_id=external_job_id, canonical_hash=canonical_hash)
 
-    now = datetime.utcnow()
+    now = now or datetime.utcnow()
 
     incoming_payload = {
         "title": job.get("title") or (posting.title if posting else "Untitled role"),
@@ -606,7 +626,13 @@ def _upsert_posting(db: Session, job: dict) -> models.JobPosting:
         "description": job.get("description") or (posting.description if posting else ""),
         "modality": job.get("modality") if job.get("modality") is not None else (posting.modality if posting else None),
     }
-    content_hash = compute_job_content_hash(incoming_payload)
+    if posting and posting.job_content_hash and all(
+        incoming_payload[field] == getattr(posting, field) for field in _CONTENT_HASH_FIELDS
+    ):
+        # Re-scrape of an unchanged posting: the stored hash is still valid.
+        content_hash = posting.job_content_hash
+    else:
+        content_hash = compute_job_content_hash(incoming_payload)
 
     if posting:
         posting.source = source
@@ -640,27 +666,75 @@ def _upsert_posting(db: Session, job: dict) -> models.JobPosting:
         db.flush()
         return posting
 
-    posting = models.JobPosting(
-        source=source,
-        external_job_id=external_job_id,
-        canonical_url=job.get("canonical_url") or "",
-        canonical_url_hash=canonical_hash,
-        title=incoming_payload["title"] or "Untitled role",
-        company=incoming_payload["company"],
-        location=incoming_payload["location"],
-        description=incoming_payload["description"] or "",
-        modality=incoming_payload["modality"],
-        easy_apply=bool(job.get("easy_apply", False)),
-        applicant_count=int(job.get("applicant_count") or 0),
-        applicant_count_raw=job.get("applicant_count_raw"),
-        posted_at=job.get("posted_at"),
-        first_seen_at=now,
-        last_seen_at=now,
-        job_content_hash=content_hash,
+    return _insert_posting(
+        db,
+        {
+            "source": source,
+            "external_job_id": external_job_id,
+            "canonical_url": job.get("canonical_url") or "",
+            "canonical_url_hash": canonical_hash,
+            "title": incoming_payload["title"] or "Untitled role",
+            "company": incoming_payload["company"],
+            "location": incoming_payload["location"],
+            "description": incoming_payload["description"] or "",
+            "modality": incoming_payload["modality"],
+            "easy_apply": bool(job.get("easy_apply", False)),
+            "applicant_count": int(job.get("applicant_count") or 0),
+            "applicant_count_raw": job.get("applicant_count_raw"),
+            "posted_at": job.get("posted_at"),
+            "first_seen_at": now,
+            "last_seen_at": now,
+            "job_content_hash": content_hash,
+        },
     )
-    db.add(posting)
-    db.flush()
-    return posting
+
+
+def _find_posting(
+    db: Session,
+    *,
+    source: str,
+    external_job_id: str | None,
+    canonical_hash: str,
+) -> models.JobPosting | None:
+    # One lookup for both dedupe keys; an external id match wins over a canonical URL match.
+    conditions = []
+    if external_job_id:
+        conditions.append(
+            and_(
+                models.JobPosting.source == source,
+                models.JobPosting.external_job_id == external_job_id,
+            )
+        )
+    if canonical_hash:
+        conditions.append(models.JobPosting.canonical_url_hash == canonical_hash)
+    if not conditions:
+        return None
+
+    stmt = select(models.JobPosting).where(or_(*conditions))
+    if external_job_id:
+        stmt = stmt.order_by(case((conditions[0], 0), else_=1))
+    return db.scalar(stmt.limit(1))
+
+
+_POSTING_UPSERT_PRESERVED = {"id", "first_seen_at", "job_category", "job_subcategory"}
+
+
+def _insert_posting(db: Session, values: dict) -> models.JobPosting:
+    if db.get_bind().dialect.name != "sqlite":
+        posting = models.JobPosting(**values)
+        db.add(posting)
+        db.flush()
+        return posting
+
+    # INSERT ... ON CONFLICT DO UPDATE ... RETURNING: a row written concurrently by another
+    # run (e.g. the scheduler) is refreshed in place instead of raising IntegrityError.
+    conflict_target = ["source", "external_job_id"] if values.get("external_job_id") else ["canonical_url_hash"]
+    stmt = sqlite_insert(models.JobPosting).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=conflict_target,
+        set_={key: stmt.excluded[key] for key in values if key not in _POSTING_UPSERT_PRESERVED},
+    ).returning(models.JobPosting)
+    return db.scalars(stmt, execution_options={"populate_existing": True}).one()
 
 
 def _job_payload(posting: models.JobPosting) -> dict:
@@ -676,43 +750,44 @@ def _job_payload(posting: models.JobPosting) -> dict:
     }
 
 
-def _recency_score(posted_at: datetime | None) -> float:
+# (max age in hours, score); older postings score 25.
+_RECENCY_BUCKETS = ((1, 100.0), (3, 85.0), (8, 70.0), (24, 55.0), (72, 40.0))
+
+
+def _recency_score(posted_at: datetime | None, *, now: datetime | None = None) -> float:
     if not posted_at:
         return 30.0
 
-    age_hours = max((datetime.utcnow() - posted_at).total_seconds() / 3600.0, 0.0)
-    if age_hours <= 1:
-        return 100.0
-    if age_hours <= 3:
-        return 85.0
-    if age_hours <= 8:
-        return 70.0
-    if age_hours <= 24:
-        return 55.0
-    if age_hours <= 72:
-        return 40.0
-    return 25.0
+    age_hours = max(((now or datetime.utcnow()) - posted_at).total_seconds() / 3600.0, 0.0)
+    return next((value for max_hours, value in _RECENCY_BUCKETS if age_hours <= max_hours), 25.0)
 
 
 def _location_score(
     job_location: str | None,
     modality: str | None,
-    search_city: str | None,
-    search_country: str | None,
+    city_low: str,
+    country_low: str,
 ) -> float:
+    # city_low/country_low are lowercased and stripped once per run by the caller.
+    if not city_low and not country_low:
+        return 70.0 if (modality or "").lower() in {"remote", "hybrid"} else 40.0
+
     loc = (job_location or "").lower()
-    city = (search_city or "").lower().strip()
-    country = (search_country or "").lower().strip()
 
-    if city and city in loc:
+    if city_low and city_low in loc:
         return 100.0
-    if country and country in loc:
+    if country_low and country_low in loc:
         return 80.0
     if (modality or "").lower() in {"remote", "hybrid"}:
         return 70.0
     return 40.0
 
 
+# Weights for (llm, deterministic, recency, location, personalization).
+_FINAL_WEIGHTS_LLM = (0.50, 0.20, 0.10, 0.10, 0.10)
+_FINAL_WEIGHTS_FALLBACK = (0.0, 0.65, 0.15, 0.10, 0.10)
+
+
 def _final_score(
     *,
     deterministic_score: float,
@@ -722,21 +797,9 @@ def _final_score(
     personalization_score: float,
     llm_status: str,
 ) -> float:
-    if llm_status == "ok":
-        value = (
-            (0.50 * llm_score)
-            + (0.20 * deterministic_score)
-            + (0.10 * recency_score)
-            + (0.10 * location_score)
-            + (0.10 * personalization_score)
-        )
-    else:
-        value = (
-            (0.65 * deterministic_score)
-            + (0.15 * recency_score)
-            + (0.10 * location_score)
-            + (0.10 * personalization_score)
-        )
+    weights = _FINAL_WEIGHTS_LLM if llm_status == "ok" else _FINAL_WEIGHTS_FALLBACK
+    components = (llm_score, deterministic_score, recency_score, location_score, personalization_score)
+    value = sum(weight * component for weight, component in zip(weights, components))
     return round(value, 2)
 
 
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import desc, select
+from sqlalchemy import case, desc, func, insert, or_, select, true, update
 from sqlalchemy import delete as sa_delete
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app import models
+from app.config import settings
+
+# Callers render the CV filename/text next to each session; a many-to-one join keeps it to one query.
+_WITH_CV = (joinedload(models.CVSession.cv),)
 
 
 def create_session(
@@ -17,56 +21,42 @@ def create_session(
     active_search_id: str | None = None,
     analysis_executed_at: datetime | None = None,
 ) -> models.CVSession:
-    _deactivate_active_sessions(db)
     now = datetime.utcnow()
-    session = models.CVSession(
-        cv_id=cv_id,
-        active_search_id=active_search_id,
-        ui_state_json=ui_state_json or {},
-        analysis_executed_at=analysis_executed_at,
-        status="active",
-        created_at=now,
-        last_seen_at=now,
-    )
-    db.add(session)
-    db.flush()
-    return session
+    _deactivate_active_sessions(db, now=now)
+    # INSERT ... RETURNING hands back a persistent instance without a unit-of-work flush.
+    return db.scalars(
+        insert(models.CVSession)
+        .values(
+            cv_id=cv_id,
+            active_search_id=active_search_id,
+            ui_state_json=ui_state_json or {},
+            analysis_executed_at=analysis_executed_at,
+            status="active",
+            created_at=now,
+            last_seen_at=now,
+        )
+        .returning(models.CVSession)
+    ).one()
 
 
 def get_current_session(db: Session, *, session_id: str | None = None) -> models.CVSession | None:
+    # One probe: the requested session first, then the most recent active one, then any non-closed one.
+    priority = [(models.CVSession.status == "active", 1)]
     if session_id:
-        session = db.get(models.CVSession, session_id)
-        if session and session.status != "closed":
-            _touch(session)
-            db.add(session)
-            db.commit()
-            db.refresh(session)
-            return session
-
-    session = db.scalar(
-        select(models.CVSession)
-        .where(models.CVSession.status == "active")
-        .order_by(desc(models.CVSession.last_seen_at))
-    )
-    if session:
-        _touch(session)
-        db.add(session)
-        db.commit()
-        db.refresh(session)
-        return session
-
+        priority.insert(0, (models.CVSession.id == session_id, 0))
     session = db.scalar(
         select(models.CVSession)
+        .options(*_WITH_CV)
         .where(models.CVSession.status != "closed")
-        .order_by(desc(models.CVSession.last_seen_at))
+        .order_by(case(*priority, else_=2), desc(models.CVSession.last_seen_at))
+        .limit(1)
     )
     if not session:
         return None
 
-    _touch(session)
-    db.add(session)
-    db.commit()
-    db.refresh(session)
+    # A polling read only writes when last_seen_at is stale.
+    if _touch(session, now=datetime.utcnow()):
+        db.commit()
     return session
 
 
@@ -77,33 +67,30 @@ def resume_session(
     active_search_id: str | None = None,
     ui_state_json: dict | None = None,
 ) -> models.CVSession | None:
-    session = db.get(models.CVSession, session_id)
+    session = db.get(models.CVSession, session_id, options=_WITH_CV)
     if not session:
         return None
 
-    _deactivate_active_sessions(db, keep_session_id=session.id)
+    now = datetime.utcnow()
+    _deactivate_active_sessions(db, now=now, keep_session_id=session.id)
     session.status = "active"
     if active_search_id is not None:
         session.active_search_id = active_search_id
     if ui_state_json is not None:
         session.ui_state_json = ui_state_json
-    _touch(session)
-    db.add(session)
+    session.last_seen_at = now
     db.commit()
-    db.refresh(session)
     return session
 
 
 def close_session(db: Session, *, session_id: str) -> models.CVSession | None:
-    session = db.get(models.CVSession, session_id)
+    session = db.get(models.CVSession, session_id, options=_WITH_CV)
     if not session:
         return None
 
     session.status = "closed"
-    _touch(session)
-    db.add(session)
+    session.last_seen_at = datetime.utcnow()
     db.commit()
-    db.refresh(session)
     return session
 
 
@@ -114,7 +101,7 @@ def update_session_state(
     active_search_id: str | None = None,
     ui_state_json: dict | None = None,
 ) -> models.CVSession | None:
-    session = db.get(models.CVSession, session_id)
+    session = db.get(models.CVSession, session_id, options=_WITH_CV)
     if not session or session.status == "closed":
         return None
 
@@ -122,26 +109,41 @@ def update_session_state(
         session.active_search_id = active_search_id
     if ui_state_json is not None:
         session.ui_state_json = ui_state_json
-    _touch(session)
-    db.add(session)
+    session.last_seen_at = datetime.utcnow()
     db.commit()
-    db.refresh(session)
     return session
 
 
-def list_sessions(db: Session, *, limit: int = 50) -> list[models.CVSession]:
+def list_sessions(db: Session, *, limit: int = 50) -> list[dict]:
     safe_limit = max(1, min(limit, 200))
-    rows = db.scalars(select(models.CVSession).order_by(desc(models.CVSession.created_at))).all()
-    out: list[models.CVSession] = []
-    seen_cv_ids: set[str] = set()
-    for session in rows:
-        if session.cv_id in seen_cv_ids:
-            continue
-        seen_cv_ids.add(session.cv_id)
-        out.append(session)
-        if len(out) >= safe_limit:
-            break
-    return out
+    # Latest session per CV, ranked and limited in SQL so only returned rows are hydrated.
+    ranked = select(
+        models.CVSession.id.label("id"),
+        func.row_number()
+        .over(partition_by=models.CVSession.cv_id, order_by=desc(models.CVSession.created_at))
+        .label("rn"),
+    ).subquery()
+    # Plain row mappings: the history view is read-only, so ORM identity tracking is skipped.
+    rows = db.execute(
+        select(
+            models.CVSession.id,
+            models.CVSession.cv_id,
+            models.CVSession.active_search_id,
+            models.CVSession.ui_state_json,
+            models.CVSession.status,
+            models.CVSession.analysis_executed_at,
+            models.CVSession.created_at,
+            models.CVSession.last_seen_at,
+            models.CVDocument.filename.label("cv_filename"),
+            models.CVDocument.raw_text.label("cv_raw_text"),
+        )
+        .join(ranked, ranked.c.id == models.CVSession.id)
+        .outerjoin(models.CVDocument, models.CVDocument.id == models.CVSession.cv_id)
+        .where(ranked.c.rn == 1)
+        .order_by(desc(models.CVSession.created_at))
+        .limit(safe_limit)
+    ).mappings()
+    return [dict(row) for row in rows]
 
 
 def get_latest_session_for_cv(db: Session, *, cv_id: str) -> models.CVSession | None:
@@ -149,18 +151,20 @@ def get_latest_session_for_cv(db: Session, *, cv_id: str) -> models.CVSession |
         select(models.CVSession)
         .where(models.CVSession.cv_id == cv_id)
         .order_by(desc(models.CVSession.created_at))
+        .limit(1)
     )
 
 
 def delete_session_group(db: Session, *, session_id: str) -> bool:
-    target = db.get(models.CVSession, session_id)
-    if not target:
-        return False
-
-    db.execute(sa_delete(models.CVSession).where(models.CVSession.cv_id == target.cv_id))
+    # One statement: the subquery resolves the CV, RETURNING tells us whether anything matched.
+    group_cv_id = select(models.CVSession.cv_id).where(models.CVSession.id == session_id).scalar_subquery()
+    deleted_ids = db.execute(
+        sa_delete(models.CVSession)
+        .where(models.CVSession.cv_id == group_cv_id)
+        .returning(models.CVSession.id)
+    ).all()
     db.commit()
-    return True
-
+    return bool(deleted_ids)
 
 
 def purge_database_except_active_session(
@@ -168,90 +172,80 @@ def purge_database_except_active_session(
     *,
     keep_session_id: str | None = None,
 ) -> dict[str, int | str | None]:
-    keep_session: models.CVSession | None = None
+    # One probe: the requested session first, then the most recent active one, then the most recent of any.
+    priority = [(models.CVSession.status == "active", 1)]
     if keep_session_id:
-        keep_session = db.get(models.CVSession, keep_session_id)
-
-    if not keep_session:
-        keep_session = db.scalar(
-            select(models.CVSession)
-            .where(models.CVSession.status == "active")
-            .order_by(desc(models.CVSession.last_seen_at))
-        )
-
-    if not keep_session:
-        keep_session = db.scalar(select(models.CVSession).order_by(desc(models.CVSession.last_seen_at)))
+        priority.insert(0, (models.CVSession.id == keep_session_id, 0))
+    keep_session = db.scalar(
+        select(models.CVSession)
+        .order_by(case(*priority, else_=2), desc(models.CVSession.last_seen_at))
+        .limit(1)
+    )
 
     kept_session_id = keep_session.id if keep_session else None
     kept_cv_id = keep_session.cv_id if keep_session else None
     kept_search_id = keep_session.active_search_id if keep_session else None
 
-    if kept_session_id:
-        deleted_sessions = (
-            db.execute(sa_delete(models.CVSession).where(models.CVSession.id != kept_session_id)).rowcount or 0
+    # Usage logs keep SET NULL on their CV, so they are swept explicitly: other CVs' and CV-less ones.
+    usage_log_filter = (
+        or_(models.LLMUsageLog.cv_id.is_(None), models.LLMUsageLog.cv_id != kept_cv_id) if kept_cv_id else true()
+    )
+
+    # Counted up front: rows removed through ON DELETE CASCADE are not reflected in rowcount.
+    counts = db.execute(
+        select(
+            _count_where(models.CVSession, models.CVSession.id != kept_session_id if kept_session_id else true()),
+            _count_where(models.Insight, models.Insight.cv_id != kept_cv_id if kept_cv_id else true()),
+            _count_where(models.LLMUsageLog, usage_log_filter),
         )
-    else:
-        deleted_sessions = db.execute(sa_delete(models.CVSession)).rowcount or 0
+    ).one()
+    deleted_sessions, deleted_insights, deleted_llm_usage_logs = (int(value or 0) for value in counts)
 
+    deleted_searches_same_cv = 0
     if kept_cv_id:
-        if kept_search_id:
-            deleted_searches_same_cv = (
-                db.execute(
-                    sa_delete(models.SearchConfig).where(
-                        models.SearchConfig.cv_id == kept_cv_id,
-                        models.SearchConfig.id != kept_search_id,
-                    )
-                ).rowcount
-                or 0
-            )
-        else:
-            deleted_searches_same_cv = (
-                db.execute(
-                    sa_delete(models.SearchConfig).where(models.SearchConfig.cv_id == kept_cv_id)
-                ).rowcount
-                or 0
+        # Cascades cannot express "same CV, other rows", so those stay explicit.
+        db.execute(
+            sa_delete(models.CVSession).where(
+                models.CVSession.cv_id == kept_cv_id,
+                models.CVSession.id != kept_session_id,
             )
-
-        deleted_cv_documents = (
-            db.execute(sa_delete(models.CVDocument).where(models.CVDocument.id != kept_cv_id)).rowcount
-            or 0
         )
-        deleted_insights = (
-            db.execute(sa_delete(models.Insight).where(models.Insight.cv_id != kept_cv_id)).rowcount
-            or 0
-        )
-        deleted_llm_usage_logs = (
-            db.execute(
-                sa_delete(models.LLMUsageLog).where(
-                    (models.LLMUsageLog.cv_id.is_(None))
-                    | (models.LLMUsageLog.cv_id != kept_cv_id)
-                )
-            ).rowcount
-            or 0
-        )
-    else:
-        deleted_searches_same_cv = 0
-        deleted_cv_documents = db.execute(sa_delete(models.CVDocument)).rowcount or 0
-        deleted_insights = db.execute(sa_delete(models.Insight)).rowcount or 0
-        deleted_llm_usage_logs = db.execute(sa_delete(models.LLMUsageLog)).rowcount or 0
-
-    orphan_result_exists = select(models.SearchResult.id).where(
-        models.SearchResult.job_posting_id == models.JobPosting.id
+        search_filter = [models.SearchConfig.cv_id == kept_cv_id]
+        if kept_search_id:
+            search_filter.append(models.SearchConfig.id != kept_search_id)
+        deleted_searches_same_cv = db.execute(sa_delete(models.SearchConfig).where(*search_filter)).rowcount or 0
+
+    db.execute(sa_delete(models.LLMUsageLog).where(usage_log_filter))
+
+    # Dropping the other CVs cascades to their profiles, sessions, searches (runs, results,
+    # checks), interactions and insights.
+    cv_filter = [models.CVDocument.id != kept_cv_id] if kept_cv_id else []
+    deleted_cv_documents = db.execute(sa_delete(models.CVDocument).where(*cv_filter)).rowcount or 0
+
+    # Anti-join: postings with no search result left.
+    orphan_job_ids = (
+        select(models.JobPosting.id)
+        .outerjoin(models.SearchResult, models.SearchResult.job_posting_id == models.JobPosting.id)
+        .where(models.SearchResult.id.is_(None))
     )
     deleted_orphan_jobs = (
-        db.execute(sa_delete(models.JobPosting).where(~orphan_result_exists.exists())).rowcount or 0
+        db.execute(
+            sa_delete(models.JobPosting)
+            .where(models.JobPosting.id.in_(orphan_job_ids))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        or 0
     )
 
-    db.commit()
-
     if kept_session_id:
-        surviving = db.get(models.CVSession, kept_session_id)
-        if surviving:
-            _deactivate_active_sessions(db, keep_session_id=surviving.id)
-            surviving.status = "active"
-            _touch(surviving)
-            db.add(surviving)
-            db.commit()
+        # Every other session is gone at this point, so the kept one is simply re-activated.
+        db.execute(
+            update(models.CVSession)
+            .where(models.CVSession.id == kept_session_id)
+            .values(status="active", last_seen_at=datetime.utcnow())
+        )
+
+    db.commit()
 
     return {
         "kept_session_id": kept_session_id,
@@ -266,18 +260,21 @@ def purge_database_except_active_session(
     }
 
 
-def _deactivate_active_sessions(db: Session, *, keep_session_id: str | None = None) -> None:
-    active_sessions = db.scalars(
-        select(models.CVSession).where(models.CVSession.status == "active")
-    ).all()
-    for active_session in active_sessions:
-        if keep_session_id and active_session.id == keep_session_id:
-            continue
-        active_session.status = "inactive"
-        _touch(active_session)
-        db.add(active_session)
-    db.flush()
+def _deactivate_active_sessions(db: Session, *, now: datetime, keep_session_id: str | None = None) -> None:
+    stmt = update(models.CVSession).where(models.CVSession.status == "active")
+    if keep_session_id:
+        stmt = stmt.where(models.CVSession.id != keep_session_id)
+    # Single UPDATE; the default session sync still patches any loaded instances in memory.
+    db.execute(stmt.values(status="inactive", last_seen_at=now))
 
 
-def _touch(session: models.CVSession) -> None:
-    session.last_seen_at = datetime.utcnow()
+def _touch(session: models.CVSession, *, now: datetime) -> bool:
+    last_seen_at = session.last_seen_at
+    if last_seen_at and (now - last_seen_at).total_seconds() < settings.session_touch_throttle_seconds:
+        return False
+    session.last_seen_at = now
+    return True
+
+
+def _count_where(model, criterion):
+    return select(func.count()).select_from(model).where(criterion).scalar_subquery()
@@ -0,0 +1,164 @@
+import os
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+# Must run before app.db builds its engine: one shared in-memory database (StaticPool) for the suite.
+# Under pytest-xdist (`pytest -n auto`) every worker is its own process, hence its own database.
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload
+
+from app import models
+from app.db import Base, SessionLocal, engine, init_db
+from app.main import app
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    init_db()
+
+
+class _IdleScheduler:
+    def __init__(self, *_args, **_kwargs) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _idle_scheduler():
+    """Keep the app lifespan from starting the background polling task; the scheduler API only reads DB state."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("app.main.SearchScheduler", _IdleScheduler)
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _pdf_extractor():
+    """Stub PDF text extraction once for the session; tests pick the extracted text through ``cv_text``."""
+    mock = MagicMock(return_value="")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("app.services.cv_extract._extract_pdf", mock)
+        yield mock
+
+
+@pytest.fixture
+def cv_text(_pdf_extractor):
+    """Set the text that uploaded "PDFs" extract to for the current test."""
+
+    def _set(text: str) -> None:
+        _pdf_extractor.return_value = text
+
+    yield _set
+    _pdf_extractor.return_value = ""
+
+
+# Singleton rows owned by the app itself (runtime settings, scheduler state) survive cleanup.
+_PRESERVED_TABLES = {"app_settings", "scheduler_state"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    """One TestClient, and so one app lifespan, shared by every test in the module."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def clean_db():
+    """Empty the domain tables so tests sharing the module client start from a blank slate."""
+    init_db()
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in _PRESERVED_TABLES:
+                conn.execute(table.delete())
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Fail when the wrapped block emits more than ``limit`` SQL statements."""
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        statements: list[str] = []
+
+        def _before_cursor_execute(_conn, _cursor, statement, _parameters, _context, _executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+        assert len(statements) <= limit, f"expected <= {limit} statements, got {len(statements)}:\n" + "\n".join(
+            statements
+        )
+
+    return _assert_max_queries
+
+
+@pytest.fixture
+def strict_db():
+    """Session whose ORM loads raise on any relationship not loaded explicitly (hidden N+1 guard)."""
+    init_db()
+    db = SessionLocal()
+
+    def _raise_on_lazy_load(state) -> None:
+        if state.is_select and not state.is_relationship_load:
+            state.statement = state.statement.options(raiseload("*"))
+
+    event.listen(db, "do_orm_execute", _raise_on_lazy_load)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _scrape_stub():
+    """Stub the LinkedIn scraper once for the session so no test reaches the network."""
+    mock = MagicMock(return_value=[])
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("app.services.search_service.scrape_jobs", mock)
+        yield mock
+
+
+@pytest.fixture
+def scraper(_scrape_stub):
+    """The session's scraper stub; set ``return_value`` to the jobs it should yield in this test."""
+    yield _scrape_stub
+    _scrape_stub.reset_mock(return_value=True, side_effect=True)
+    _scrape_stub.return_value = []
+
+
+@pytest.fixture
+def seed_cv():
+    """Insert a CV and its profile directly, skipping upload, text extraction and summarization."""
+
+    def _seed_cv(raw_text: str, summary: dict) -> str:
+        with SessionLocal() as db:
+            cv = models.CVDocument(filename="cv.pdf", file_hash=uuid4().hex, raw_text=raw_text)
+            db.add(cv)
+            db.flush()
+            db.add(
+                models.CandidateProfile(
+                    cv_id=cv.id,
+                    summary_json=summary,
+                    skills_json=summary.get("skills", []),
+                    experience_json=summary.get("experience", []),
+                    education_json=summary.get("education", []),
+                    languages_json=summary.get("languages", []),
+                )
+            )
+            db.commit()
+            return cv.id
+
+    return _seed_cv
@@ -0,0 +1,19 @@
+from app.services.bounded_cache import BoundedLRU
+
+
+def test_bounded_lru_evicts_least_recent_and_copies_values():
+    cache = BoundedLRU(2, list)
+    original = ["a"]
+    cache.put("a", original)
+    cache.put("b", ["b"])
+    original.append("changed")
+
+    assert cache.get("a") == ["a"]
+    cache.get("a").append("changed")
+    assert cache.get("a") == ["a"]
+
+    # "b" is now the least recently used entry.
+    cache.put("c", ["c"])
+    assert cache.get("b") is None
+    assert cache.get("a") == ["a"]
+    assert cache.get("c") == ["c"]
@@ -1,8 +1,3 @@
-from io import BytesIO
-
-from fastapi.testclient import TestClient
-
-from app.main import app
 from app.services.cv_summary import summarize_cv_text
 
 
@@ -71,28 +66,24 @@ def test_cv_summary_includes_academic_and_hr_experience():
     assert "administrador publico" in joined_edu
 
 
-def test_cv_analyze_endpoint(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Senior Data Analyst\nSkills: Python, SQL\nEducation: Bachelor",
-    )
+def test_cv_analyze_endpoint(client, cv_text):
+    cv_text("Senior Data Analyst\nSkills: Python, SQL\nEducation: Bachelor")
 
-    with TestClient(app) as client:
-        upload = client.post(
-            "/api/cv/upload",
-            files={"file": ("cv.pdf", BytesIO(b"x"), "application/pdf")},
-        )
-        assert upload.status_code == 200
-        cv_id = upload.json()["cv_id"]
-
-        analyze = client.post(f"/api/cv/{cv_id}/analyze")
-        assert analyze.status_code == 200
-        body = analyze.json()
-        assert "analysis" in body
-        assert "recommended_queries" in body["analysis"]
-
-        strategy = client.get(f"/api/cv/{cv_id}/strategy")
-        assert strategy.status_code == 200
-        strategy_body = strategy.json()
-        assert "recommended_queries" in strategy_body
-        assert "market_roles" in strategy_body
+    upload = client.post(
+        "/api/cv/upload",
+        files={"file": ("cv.pdf", b"x", "application/pdf")},
+    )
+    assert upload.status_code == 200
+    cv_id = upload.json()["cv_id"]
+
+    analyze = client.post(f"/api/cv/{cv_id}/analyze")
+    assert analyze.status_code == 200
+    body = analyze.json()
+    assert "analysis" in body
+    assert "recommended_queries" in body["analysis"]
+
+    strategy = client.get(f"/api/cv/{cv_id}/strategy")
+    assert strategy.status_code == 200
+    strategy_body = strategy.json()
+    assert "recommended_queries" in strategy_body
+    assert "market_roles" in strategy_body
@@ -1,88 +1,80 @@
-from io import BytesIO
-
-from fastapi.testclient import TestClient
+import pytest
 from sqlalchemy import select
 
 from app import models
 from app.db import SessionLocal
-from app.main import app
 
+pytestmark = pytest.mark.usefixtures("clean_db")
 
-def test_interaction_learning_improves_next_scoring(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Data Analyst\nSkills: Python, SQL\nEducation: Bachelor",
-    )
+
+def test_interaction_learning_improves_next_scoring(monkeypatch, client, scraper, cv_text):
+    cv_text("Data Analyst\nSkills: Python, SQL\nEducation: Bachelor")
     monkeypatch.setattr("app.services.market_demand_service._fetch_internet_demand", lambda terms: [])
 
-    def fake_scrape_jobs(keywords, location, time_window_hours, **kwargs):
-        return [
-            {
-                "source": "linkedin_public",
-                "external_job_id": "feedback-1",
-                "canonical_url": "https://www.linkedin.com/jobs/view/feedback-1",
-                "canonical_url_hash": "h-feedback-1",
-                "title": "Data Analyst",
-                "company": "Acme",
-                "location": "Santiago",
-                "description": "Python SQL analytics role",
-                "modality": "hybrid",
-                "easy_apply": True,
-                "applicant_count": 12,
-                "applicant_count_raw": "12 applicants",
-                "posted_at": None,
-            }
-        ]
-
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_scrape_jobs)
-
-    with TestClient(app) as client:
-        upload = client.post(
-            "/api/cv/upload",
-            files={"file": ("cv-feedback.pdf", BytesIO(b"feedback-a"), "application/pdf")},
-        )
-        assert upload.status_code == 200
-        cv_id = upload.json()["cv_id"]
-        session_id = upload.json()["session_id"]
-
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["Data Analyst"],
-            },
-        )
-        assert created.status_code == 200
-        search_id = created.json()["search_id"]
-        first_row = created.json()["results"]["items"][0]
-        first_score = float(first_row["final_score"])
-
-        logged = client.post(
-            "/api/interactions",
-            json={
-                "cv_id": cv_id,
-                "session_id": session_id,
-                "search_id": search_id,
-                "result_id": first_row["result_id"],
-                "job_id": first_row["job_id"],
-                "event_type": "open",
-                "dwell_ms": 95000,
-            },
-        )
-        assert logged.status_code == 200
-
-        rerun = client.post(f"/api/searches/{search_id}/run")
-        assert rerun.status_code == 200
-
-        fetched = client.get(f"/api/searches/{search_id}/results?sort_by=best_fit")
-        assert fetched.status_code == 200
-        rows = fetched.json()["items"]
-        assert rows
-        second_score = float(rows[0]["final_score"])
-        assert second_score >= first_score
+    scraper.return_value = [
+        {
+            "source": "linkedin_public",
+            "external_job_id": "feedback-1",
+            "canonical_url": "https://www.linkedin.com/jobs/view/feedback-1",
+            "canonical_url_hash": "h-feedback-1",
+            "title": "Data Analyst",
+            "company": "Acme",
+            "location": "Santiago",
+            "description": "Python SQL analytics role",
+            "modality": "hybrid",
+            "easy_apply": True,
+            "applicant_count": 12,
+            "applicant_count_raw": "12 applicants",
+            "posted_at": None,
+        }
+    ]
+
+    upload = client.post(
+        "/api/cv/upload",
+        files={"file": ("cv-feedback.pdf", b"feedback-a", "application/pdf")},
+    )
+    assert upload.status_code == 200
+    cv_id = upload.json()["cv_id"]
+    session_id = upload.json()["session_id"]
+
+    created = client.post(
+        "/api/searches",
+        json={
+            "cv_id": cv_id,
+            "country": "Chile",
+            "city": "Santiago",
+            "time_window_hours": 24,
+            "keywords": ["Data Analyst"],
+        },
+    )
+    assert created.status_code == 200
+    search_id = created.json()["search_id"]
+    first_row = created.json()["results"]["items"][0]
+    first_score = float(first_row["final_score"])
+
+    logged = client.post(
+        "/api/interactions",
+        json={
+            "cv_id": cv_id,
+            "session_id": session_id,
+            "search_id": search_id,
+            "result_id": first_row["result_id"],
+            "job_id": first_row["job_id"],
+            "event_type": "open",
+            "dwell_ms": 95000,
+        },
+    )
+    assert logged.status_code == 200
+
+    rerun = client.post(f"/api/searches/{search_id}/run")
+    assert rerun.status_code == 200
+
+    fetched = client.get(f"/api/searches/{search_id}/results?sort_by=best_fit")
+    assert fetched.status_code == 200
+    rows = fetched.json()["items"]
+    assert rows
+    second_score = float(rows[0]["final_score"])
+    assert second_score >= first_score
 
     with SessionLocal() as db:
         profile = db.scalar(select(models.CandidateProfile).where(models.CandidateProfile.cv_id == cv_id))
@@ -93,35 +85,34 @@ def test_interaction_learning_improves_next_scoring(monkeypatch):
         assert float(title_scores["data analyst"]) > 0
 
 
-def test_generate_insight_and_fetch_latest(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Public Administrator\nSkills: Gestion Publica, RRHH\nEducation: Administrador Publico",
-    )
+def test_generate_insight_and_fetch_latest(monkeypatch, client, seed_cv):
     monkeypatch.setattr("app.services.market_demand_service._fetch_internet_demand", lambda terms: [])
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", lambda **kwargs: [])
-
-    with TestClient(app) as client:
-        upload = client.post(
-            "/api/cv/upload",
-            files={"file": ("cv-insight.pdf", BytesIO(b"feedback-b"), "application/pdf")},
-        )
-        assert upload.status_code == 200
-        cv_id = upload.json()["cv_id"]
-
-        generated = client.post(
-            f"/api/insights/cv/{cv_id}/generate",
-            json={"days": 7},
-        )
-        assert generated.status_code == 200
-        insight = generated.json()
-        assert insight["cv_id"] == cv_id
-        assert "insights" in insight
-        assert "fit_outlook" in insight["insights"]
-        assert "search_improvements" in insight["insights"]
-
-        latest = client.get(f"/api/insights/cv/{cv_id}/latest")
-        assert latest.status_code == 200
-        latest_body = latest.json()
-        assert latest_body is not None
-        assert latest_body["insight_id"] == insight["insight_id"]
+
+    # Insights only need a CV with a profile; the upload path is covered above.
+    cv_id = seed_cv(
+        "Public Administrator\nSkills: Gestion Publica, RRHH\nEducation: Administrador Publico",
+        {
+            "highlights": ["Public Administrator"],
+            "skills": ["gestion publica", "rrhh"],
+            "experience": ["Public Administrator"],
+            "education": ["Administrador Publico"],
+            "languages": [],
+        },
+    )
+
+    generated = client.post(
+        f"/api/insights/cv/{cv_id}/generate",
+        json={"days": 7},
+    )
+    assert generated.status_code == 200
+    insight = generated.json()
+    assert insight["cv_id"] == cv_id
+    assert "insights" in insight
+    assert "fit_outlook" in insight["insights"]
+    assert "search_improvements" in insight["insights"]
+
+    latest = client.get(f"/api/insights/cv/{cv_id}/latest")
+    assert latest.status_code == 200
+    latest_body = latest.json()
+    assert latest_body is not None
+    assert latest_body["insight_id"] == insight["insight_id"]
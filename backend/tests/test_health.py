@@ -1,10 +1,4 @@
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-def test_health() -> None:
-    client = TestClient(app)
+def test_health(client) -> None:
     response = client.get("/api/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
@@ -1,4 +1,4 @@
-from app.services.matcher import compute_match
+from app.services.matcher import compute_match, compute_match_batch
 
 
 def test_matcher_returns_weighted_score_and_breakdown():
@@ -17,3 +17,13 @@ def test_matcher_returns_weighted_score_and_breakdown():
     assert score > 0
     assert breakdown["skills"] >= 0
     assert isinstance(breakdown["matched_skills"], list)
+
+
+def test_match_batch_scores_each_job_like_a_single_call():
+    profile = {"skills": ["Python", "SQL"], "experience": ["Data Analyst"], "education": []}
+    jobs = [
+        {"title": "Data Analyst", "description": "Python and SQL reporting"},
+        {"title": "Nurse", "description": "Hospital shifts"},
+    ]
+
+    assert compute_match_batch(profile, jobs) == [compute_match(profile, job) for job in jobs]
@@ -59,6 +59,26 @@ def test_analyze_profile_fallback_infers_academic_and_hr_roles(monkeypatch):
     assert "recursos humanos" in queries_text or "rrhh" in queries_text
 
 
+def test_analyze_profile_fallback_is_cached_per_summary(monkeypatch):
+    monkeypatch.setattr(settings, "llm_enabled", True)
+    monkeypatch.setattr(settings, "gemini_api_key", None)
+
+    summary = {"highlights": ["Data Analyst"], "skills": ["SQL"], "experience": ["Data Analyst"]}
+    first = analyze_profile("sample cv text", summary)
+
+    calls = []
+    monkeypatch.setattr(
+        "app.services.profile_ai_service._fallback_bundle",
+        lambda *args, **kwargs: calls.append(args) or {},
+    )
+    second = analyze_profile("another cv text", dict(summary))
+
+    assert not calls
+    assert second == first
+    second["summary"]["skills"].append("Python")
+    assert first["summary"]["skills"] == ["SQL"]
+
+
 def test_analyze_profile_merges_llm_output_with_local_role_inference(monkeypatch):
     class FakeLLMClient:
         @property
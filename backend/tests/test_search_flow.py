@@ -1,32 +1,179 @@
-from io import BytesIO
+from uuid import uuid4
 
-from fastapi.testclient import TestClient
-from sqlalchemy import select
+import pytest
+from sqlalchemy import insert
 
 from app import models
 from app.db import SessionLocal
-from app.main import app
 from app.services.job_sources import normalize_sources
-from app.services.search_service import run_search_once
-
-
-def test_sources_endpoint_lists_allowed_sources():
-    with TestClient(app) as client:
-        response = client.get("/api/searches/sources")
-        assert response.status_code == 200
-        body = response.json()
-        assert isinstance(body, list)
-        sources = {item["source_id"]: item for item in body}
-        assert "linkedin_public" in sources
-        assert "bne_public" in sources
-        assert "empleos_publicos_public" in sources
-        assert "trabajando_public" in sources
-        assert "indeed_public" in sources
-        assert sources["linkedin_public"]["enabled"] is True
-        assert sources["bne_public"]["enabled"] is True
-        assert sources["empleos_publicos_public"]["enabled"] is True
-        assert sources["trabajando_public"]["enabled"] is False
-        assert sources["indeed_public"]["enabled"] is False
+from app.services.search_service import _cached_matches, run_all_active_searches, run_search_once
+
+# The scraper stub is module-wide so no test can reach the network; tests that care set its return_value.
+pytestmark = pytest.mark.usefixtures("clean_db", "scraper")
+
+# (raw_text, summary) pairs for seed_cv; only the end-to-end flow test goes through the upload.
+_DATA_ANALYST = (
+    "Data Analyst\nSkills: Python, SQL\nEducation: Bachelor",
+    {
+        "highlights": ["Data Analyst"],
+        "skills": ["python", "sql"],
+        "experience": ["Data Analyst"],
+        "education": ["Bachelor"],
+        "languages": [],
+    },
+)
+_DATA_ENGINEER = (
+    "Data Engineer\nSkills: Python, SQL\nEducation: Bachelor",
+    {
+        "highlights": ["Data Engineer"],
+        "skills": ["python", "sql"],
+        "experience": ["Data Engineer"],
+        "education": ["Bachelor"],
+        "languages": ["English"],
+    },
+)
+_PUBLIC_ADMIN = (
+    "Public Administrator\nSkills: Policy, RRHH\nEducation: Administrador Publico",
+    {
+        "highlights": ["Public Administrator"],
+        "skills": ["policy", "rrhh"],
+        "experience": ["Public Administrator"],
+        "education": ["Administrador Publico"],
+        "languages": [],
+    },
+)
+
+
+def _linkedin_job(external_job_id: str, **fields) -> dict:
+    return {
+        "source": "linkedin_public",
+        "external_job_id": external_job_id,
+        "canonical_url": f"https://www.linkedin.com/jobs/view/{external_job_id}",
+        "canonical_url_hash": f"h-{external_job_id}",
+        "title": "Data Analyst",
+        "company": "Acme",
+        "location": "Santiago",
+        "description": "Python SQL analyst role",
+        "modality": "hybrid",
+        "easy_apply": True,
+        "applicant_count": 20,
+        "applicant_count_raw": "20 applicants",
+        "posted_at": None,
+        **fields,
+    }
+
+
+# Scraped payloads built once; search_service only reads them, so tests can share the dicts.
+_JOB_DATA_ANALYST = _linkedin_job("123")
+_JOB_POLICY_ANALYST = _linkedin_job(
+    "li-1",
+    title="Policy Analyst",
+    company="LinkedIn Co",
+    description="Public policy role",
+    applicant_count=12,
+    applicant_count_raw="12 applicants",
+)
+# Same external id twice: dedupe must keep the richer copy (applicants and longer description).
+_JOBS_SHARING_EXTERNAL_ID = [
+    _linkedin_job(
+        "999",
+        canonical_url="https://www.linkedin.com/jobs/view/999?trk=foo",
+        canonical_url_hash="h-old",
+        title="Data Engineer",
+        company="Example",
+        description="SQL",
+        modality="remote",
+        easy_apply=False,
+        applicant_count=0,
+        applicant_count_raw=None,
+    ),
+    _linkedin_job(
+        "999",
+        canonical_url_hash="h-new",
+        title="Data Engineer",
+        company="Example",
+        description="SQL Python pipelines and cloud",
+        modality="remote",
+        applicant_count=37,
+        applicant_count_raw="37 applicants",
+    ),
+]
+_JOBS_AROUND_APPLICANT_CAP = [
+    _linkedin_job(
+        "101",
+        title="Senior Data Analyst",
+        description="Python SQL analytics",
+        applicant_count=100,
+        applicant_count_raw="100 applicants",
+    ),
+    _linkedin_job("102", applicant_count=99, applicant_count_raw="99 applicants"),
+]
+
+_BASE_SEARCH = {"country": "Chile", "city": "Santiago", "time_window_hours": 24}
+
+
+def _create_search(client, cv_id: str, **overrides) -> dict:
+    created = client.post("/api/searches", json={**_BASE_SEARCH, "cv_id": cv_id, **overrides})
+    assert created.status_code == 200
+    return created.json()
+
+
+def _seed_search(cv_id: str, **overrides) -> str:
+    # A bare search_configs row for tests that drive run_search_once directly.
+    with SessionLocal() as db:
+        search_id = db.scalar(
+            insert(models.SearchConfig)
+            .values(**{**_BASE_SEARCH, "cv_id": cv_id, **overrides})
+            .returning(models.SearchConfig.id)
+        )
+        db.commit()
+    return search_id
+
+
+def _seed_results(search_id: str, count: int) -> None:
+    # Straight to the tables: pagination and clearing do not need scrape, dedupe or scoring.
+    job_ids = [str(uuid4()) for _ in range(count)]
+    with SessionLocal() as db:
+        db.execute(
+            insert(models.JobPosting),
+            [
+                {
+                    "id": job_id,
+                    "canonical_url": f"https://www.linkedin.com/jobs/view/seed-{job_id}",
+                    "canonical_url_hash": f"seed-{job_id}",
+                    "title": f"Data Analyst {idx}",
+                    "description": "Python SQL analyst role",
+                    "applicant_count": 10 + idx,
+                }
+                for idx, job_id in enumerate(job_ids)
+            ],
+        )
+        db.execute(
+            insert(models.SearchResult),
+            [
+                {"search_config_id": search_id, "job_posting_id": job_id, "final_score": 50.0 + idx}
+                for idx, job_id in enumerate(job_ids)
+            ],
+        )
+        db.commit()
+
+
+def test_sources_endpoint_lists_allowed_sources(client):
+    response = client.get("/api/searches/sources")
+    assert response.status_code == 200
+    body = response.json()
+    assert isinstance(body, list)
+    sources = {item["source_id"]: item for item in body}
+    assert "linkedin_public" in sources
+    assert "bne_public" in sources
+    assert "empleos_publicos_public" in sources
+    assert "trabajando_public" in sources
+    assert "indeed_public" in sources
+    assert sources["linkedin_public"]["enabled"] is True
+    assert sources["bne_public"]["enabled"] is True
+    assert sources["empleos_publicos_public"]["enabled"] is True
+    assert sources["trabajando_public"]["enabled"] is False
+    assert sources["indeed_public"]["enabled"] is False
 
 
 def test_disabled_sources_are_ignored_in_normalization():
@@ -34,171 +181,75 @@ def test_disabled_sources_are_ignored_in_normalization():
     assert normalize_sources(["indeed_public", "bne_public"]) == ["bne_public"]
 
 
-def test_search_flow_with_mocked_scraper(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Senior Data Analyst\nSkills: Python, SQL\nEducation: Bachelor",
-    )
+def test_search_flow_with_mocked_scraper(client, scraper, cv_text):
+    cv_text("Senior Data Analyst\nSkills: Python, SQL\nEducation: Bachelor")
 
-    def fake_scrape_jobs(keywords, location, time_window_hours, **kwargs):
-        return [
-            {
-                "source": "linkedin_public",
-                "external_job_id": "123",
-                "canonical_url": "https://www.linkedin.com/jobs/view/123",
-                "canonical_url_hash": "h1",
-                "title": "Data Analyst",
-                "company": "Acme",
-                "location": "Santiago",
-                "description": "Python SQL analyst role",
-                "modality": "hybrid",
-                "easy_apply": True,
-                "applicant_count": 20,
-                "applicant_count_raw": "20 applicants",
-                "posted_at": None,
-            }
-        ]
+    scraper.return_value = [_JOB_DATA_ANALYST]
 
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_scrape_jobs)
-
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        upload = client.post("/api/cv/upload", files=files)
-        assert upload.status_code == 200
-        cv_id = upload.json()["cv_id"]
-
-        save = client.put(
-            f"/api/cv/{cv_id}/summary",
-            json={
-                "summary": {
-                    "highlights": ["Data Analyst"],
-                    "skills": ["python", "sql"],
-                    "experience": ["Data Analyst"],
-                    "education": ["Bachelor"],
-                    "languages": ["English"],
-                }
-            },
-        )
-        assert save.status_code == 200
+    files = {"file": ("cv.pdf", b"dummy", "application/pdf")}
+    upload = client.post("/api/cv/upload", files=files)
+    assert upload.status_code == 200
+    cv_id = upload.json()["cv_id"]
 
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["Data Analyst"],
-            },
-        )
-        assert created.status_code == 200
-        body = created.json()
-
-        assert body["results"]["total"] >= 1
-        first = body["results"]["items"][0]
-        assert first["applicant_count"] == 20
-        assert "llm_fit_score" in first
-        assert "final_score" in first
-        assert "job_category" in first
-
-        check = client.patch(
-            f"/api/searches/results/{first['result_id']}/check",
-            json={"checked": True},
-        )
-        assert check.status_code == 200
-
-        fetched = client.get(f"/api/searches/{body['search_id']}/results?sort_by=best_fit")
-        assert fetched.status_code == 200
-        assert fetched.json()["items"][0]["checked"] is True
+    save = client.put(
+        f"/api/cv/{cv_id}/summary",
+        json={
+            "summary": {
+                "highlights": ["Data Analyst"],
+                "skills": ["python", "sql"],
+                "experience": ["Data Analyst"],
+                "education": ["Bachelor"],
+                "languages": ["English"],
+            }
+        },
+    )
+    assert save.status_code == 200
 
-        facets = client.get(f"/api/searches/{body['search_id']}/facets")
-        assert facets.status_code == 200
-        assert "categories" in facets.json()
+    body = _create_search(client, cv_id, keywords=["Data Analyst"])
 
+    assert body["results"]["total"] >= 1
+    first = body["results"]["items"][0]
+    assert first["applicant_count"] == 20
+    assert "llm_fit_score" in first
+    assert "final_score" in first
+    assert "job_category" in first
 
-def test_clear_results_endpoint_removes_search_results(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Data Analyst\nSkills: Python, SQL\nEducation: Bachelor",
+    check = client.patch(
+        f"/api/searches/results/{first['result_id']}/check",
+        json={"checked": True},
     )
+    assert check.status_code == 200
 
-    def fake_scrape_jobs(keywords, location, time_window_hours, **kwargs):
-        return [
-            {
-                "source": "linkedin_public",
-                "external_job_id": "clear-1",
-                "canonical_url": "https://www.linkedin.com/jobs/view/clear-1",
-                "canonical_url_hash": "h-clear-1",
-                "title": "Data Analyst",
-                "company": "Acme",
-                "location": "Santiago",
-                "description": "Python SQL analyst role",
-                "modality": "hybrid",
-                "easy_apply": True,
-                "applicant_count": 20,
-                "applicant_count_raw": "20 applicants",
-                "posted_at": None,
-            }
-        ]
+    fetched = client.get(f"/api/searches/{body['search_id']}/results?sort_by=best_fit")
+    assert fetched.status_code == 200
+    assert fetched.json()["items"][0]["checked"] is True
 
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_scrape_jobs)
+    facets = client.get(f"/api/searches/{body['search_id']}/facets")
+    assert facets.status_code == 200
+    assert "categories" in facets.json()
 
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"clear-results"), "application/pdf")}
-        upload = client.post("/api/cv/upload", files=files)
-        assert upload.status_code == 200
-        cv_id = upload.json()["cv_id"]
 
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["Data Analyst"],
-            },
-        )
-        assert created.status_code == 200
-        search_id = created.json()["search_id"]
+def test_clear_results_endpoint_removes_search_results(client, seed_cv):
+    cv_id = seed_cv(*_DATA_ANALYST)
 
-        before = client.get(f"/api/searches/{search_id}/results")
-        assert before.status_code == 200
-        assert before.json()["total"] >= 1
+    search_id = _create_search(client, cv_id, keywords=["Data Analyst"])["search_id"]
+    _seed_results(search_id, 3)
 
-        cleared = client.delete(f"/api/searches/{search_id}/results")
-        assert cleared.status_code == 200
-        assert cleared.json()["deleted"] >= 1
+    before = client.get(f"/api/searches/{search_id}/results")
+    assert before.status_code == 200
+    assert before.json()["total"] == 3
 
-        after = client.get(f"/api/searches/{search_id}/results")
-        assert after.status_code == 200
-        assert after.json()["total"] == 0
+    cleared = client.delete(f"/api/searches/{search_id}/results")
+    assert cleared.status_code == 200
+    assert cleared.json()["deleted"] == 3
 
+    after = client.get(f"/api/searches/{search_id}/results")
+    assert after.status_code == 200
+    assert after.json()["total"] == 0
 
-def test_search_respects_selected_sources(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Public Administrator\nSkills: Policy, RRHH\nEducation: Administrador Publico",
-    )
 
-    def fake_linkedin_scrape(keywords, location, time_window_hours, **kwargs):
-        return [
-            {
-                "source": "linkedin_public",
-                "external_job_id": "li-1",
-                "canonical_url": "https://www.linkedin.com/jobs/view/li-1",
-                "canonical_url_hash": "h-li-1",
-                "title": "Policy Analyst",
-                "company": "LinkedIn Co",
-                "location": "Santiago",
-                "description": "Public policy role",
-                "modality": "hybrid",
-                "easy_apply": True,
-                "applicant_count": 12,
-                "applicant_count_raw": "12 applicants",
-                "posted_at": None,
-            }
-        ]
+def test_search_respects_selected_sources(monkeypatch, client, scraper, seed_cv):
+    scraper.return_value = [_JOB_POLICY_ANALYST]
 
     def fake_fetch_jobs(
         *,
@@ -230,420 +281,142 @@ def test_search_respects_selected_sources(monkeypatch):
             }
         ]
 
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_linkedin_scrape)
     monkeypatch.setattr("app.services.search_service.fetch_jobs", fake_fetch_jobs)
 
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["public policy analyst"],
-                "sources": ["linkedin_public", "bne_public"],
-            },
-        )
-        assert created.status_code == 200
-        body = created.json()
-        source_ids = {item["source"] for item in body["results"]["items"]}
-        assert source_ids == {"linkedin_public", "bne_public"}
-
-        fetched = client.get(f"/api/searches/{body['search_id']}")
-        assert fetched.status_code == 200
-        assert fetched.json()["sources"] == ["linkedin_public", "bne_public"]
-
+    cv_id = seed_cv(*_PUBLIC_ADMIN)
 
-def test_dedupe_prioritizes_external_job_id(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Data Engineer\nSkills: Python, SQL\nEducation: Bachelor",
+    body = _create_search(
+        client,
+        cv_id,
+        keywords=["public policy analyst"],
+        sources=["linkedin_public", "bne_public"],
     )
+    source_ids = {item["source"] for item in body["results"]["items"]}
+    assert source_ids == {"linkedin_public", "bne_public"}
 
-    def fake_scrape_jobs(keywords, location, time_window_hours, **kwargs):
-        return [
-            {
-                "source": "linkedin_public",
-                "external_job_id": "999",
-                "canonical_url": "https://www.linkedin.com/jobs/view/999?trk=foo",
-                "canonical_url_hash": "h-old",
-                "title": "Data Engineer",
-                "company": "Example",
-                "location": "Santiago",
-                "description": "SQL",
-                "modality": "remote",
-                "easy_apply": False,
-                "applicant_count": 0,
-                "applicant_count_raw": None,
-                "posted_at": None,
-            },
-            {
-                "source": "linkedin_public",
-                "external_job_id": "999",
-                "canonical_url": "https://www.linkedin.com/jobs/view/999",
-                "canonical_url_hash": "h-new",
-                "title": "Data Engineer",
-                "company": "Example",
-                "location": "Santiago",
-                "description": "SQL Python pipelines and cloud",
-                "modality": "remote",
-                "easy_apply": True,
-                "applicant_count": 37,
-                "applicant_count_raw": "37 applicants",
-                "posted_at": None,
-            },
-        ]
+    fetched = client.get(f"/api/searches/{body['search_id']}")
+    assert fetched.status_code == 200
+    assert fetched.json()["sources"] == ["linkedin_public", "bne_public"]
 
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_scrape_jobs)
-
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-
-        client.put(
-            f"/api/cv/{cv_id}/summary",
-            json={
-                "summary": {
-                    "highlights": ["Data Engineer"],
-                    "skills": ["python", "sql"],
-                    "experience": ["Data Engineer"],
-                    "education": ["Bachelor"],
-                    "languages": ["English"],
-                }
-            },
-        )
 
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["Data Engineer"],
-            },
-        )
-        assert created.status_code == 200
+def test_dedupe_prioritizes_external_job_id(client, scraper, seed_cv):
+    scraper.return_value = _JOBS_SHARING_EXTERNAL_ID
 
-    with SessionLocal() as db:
-        postings = db.scalars(
-            select(models.JobPosting).where(models.JobPosting.external_job_id == "999")
-        ).all()
-        assert len(postings) == 1
-        assert postings[0].applicant_count == 37
+    cv_id = seed_cv(*_DATA_ENGINEER)
 
-        runs = db.scalars(select(models.SchedulerRun)).all()
-        assert len(runs) >= 1
+    items = _create_search(client, cv_id, keywords=["Data Engineer"])["results"]["items"]
 
+    # Both scraped rows are under the applicant cap, so a single result means a single posting.
+    assert len(items) == 1
+    assert items[0]["applicant_count"] == 37
 
-def test_search_config_can_be_updated(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Public Administrator\nSkills: RRHH, Policy\nEducation: Administrador Publico",
-    )
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", lambda **kwargs: [])
-
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["administrador publico"],
-            },
-        )
-        assert created.status_code == 200
-        search_id = created.json()["search_id"]
 
-        updated = client.patch(
-            f"/api/searches/{search_id}",
-            json={
+@pytest.mark.parametrize(
+    ("created_window", "changes"),
+    [
+        (
+            24,
+            {
                 "country": "Chile",
                 "city": "Valparaiso",
                 "time_window_hours": 3,
                 "keywords": ["academico", "analista de recursos humanos"],
             },
-        )
-        assert updated.status_code == 200
-        body = updated.json()
-        assert body["city"] == "Valparaiso"
-        assert body["time_window_hours"] == 3
-        assert body["keywords"] == ["academico", "analista de recursos humanos"]
-
-        fetched = client.get(f"/api/searches/{search_id}")
-        assert fetched.status_code == 200
-        fetched_body = fetched.json()
-        assert fetched_body["city"] == "Valparaiso"
-        assert fetched_body["time_window_hours"] == 3
-
-
-def test_create_search_does_not_auto_start_scheduler(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Public Administrator\nSkills: Policy, RRHH\nEducation: Administrador Publico",
-    )
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", lambda **kwargs: [])
-
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-
-        stop = client.post("/api/scheduler/stop")
-        assert stop.status_code == 200
-
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["administrador publico"],
-            },
-        )
-        assert created.status_code == 200
-
-        status = client.get("/api/scheduler/status")
-        assert status.status_code == 200
-        assert status.json()["is_running"] is False
-
-
-def test_search_accepts_week_and_month_windows(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Public Administrator\nSkills: RRHH, Policy\nEducation: Administrador Publico",
-    )
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", lambda **kwargs: [])
-
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 168,
-                "keywords": ["administrador publico"],
-            },
-        )
-        assert created.status_code == 200
-        search_id = created.json()["search_id"]
-
-        updated = client.patch(
-            f"/api/searches/{search_id}",
-            json={
-                "time_window_hours": 720,
-            },
-        )
-        assert updated.status_code == 200
-        body = updated.json()
-        assert body["time_window_hours"] == 720
-
-
-def test_results_endpoint_pagination(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Data Analyst\nSkills: Python, SQL\nEducation: Bachelor",
-    )
-
-    def fake_scrape_jobs(keywords, location, time_window_hours, **kwargs):
-        return [
-            {
-                "source": "linkedin_public",
-                "external_job_id": f"p-{idx}",
-                "canonical_url": f"https://www.linkedin.com/jobs/view/p-{idx}",
-                "canonical_url_hash": f"hp-{idx}",
-                "title": f"Data Analyst {idx}",
-                "company": "Acme",
-                "location": "Santiago",
-                "description": f"Python SQL analyst role {idx}",
-                "modality": "hybrid",
-                "easy_apply": True,
-                "applicant_count": 10 + idx,
-                "applicant_count_raw": f"{10 + idx} applicants",
-                "posted_at": None,
-            }
-            for idx in range(1, 6)
-        ]
-
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_scrape_jobs)
-
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["Data Analyst"],
-            },
-        )
-        assert created.status_code == 200
-        search_id = created.json()["search_id"]
-
-        page1 = client.get(f"/api/searches/{search_id}/results?page=1&page_size=2")
-        assert page1.status_code == 200
-        body1 = page1.json()
-        assert body1["total"] == 5
-        assert body1["page"] == 1
-        assert body1["page_size"] == 2
-        assert body1["total_pages"] == 3
-        assert body1["has_prev"] is False
-        assert body1["has_next"] is True
-        assert len(body1["items"]) == 2
-
-        page3 = client.get(f"/api/searches/{search_id}/results?page=3&page_size=2")
-        assert page3.status_code == 200
-        body3 = page3.json()
-        assert body3["total"] == 5
-        assert body3["page"] == 3
-        assert body3["page_size"] == 2
-        assert body3["total_pages"] == 3
-        assert body3["has_prev"] is True
-        assert body3["has_next"] is False
-        assert len(body3["items"]) == 1
-
-
-def test_scheduled_run_forces_one_hour_window(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Public Administrator\nSkills: Policy, RRHH\nEducation: Administrador Publico",
-    )
+        ),
+        (168, {"time_window_hours": 720}),
+    ],
+    ids=["location-window-keywords", "week-to-month-window"],
+)
+def test_search_config_can_be_updated(client, seed_cv, created_window, changes):
+    cv_id = seed_cv(*_PUBLIC_ADMIN)
+
+    search_id = _create_search(
+        client, cv_id, time_window_hours=created_window, keywords=["administrador publico"]
+    )["search_id"]
+
+    updated = client.patch(f"/api/searches/{search_id}", json=changes)
+    assert updated.status_code == 200
+    fetched = client.get(f"/api/searches/{search_id}")
+    assert fetched.status_code == 200
+    for body in (updated.json(), fetched.json()):
+        for key, value in changes.items():
+            assert body[key] == value
+
+
+def test_create_search_does_not_auto_start_scheduler(client, seed_cv):
+    cv_id = seed_cv(*_PUBLIC_ADMIN)
+
+    stop = client.post("/api/scheduler/stop")
+    assert stop.status_code == 200
+
+    _create_search(client, cv_id, keywords=["administrador publico"])
+
+    status = client.get("/api/scheduler/status")
+    assert status.status_code == 200
+    assert status.json()["is_running"] is False
+
+
+def test_results_endpoint_pagination(client, seed_cv):
+    cv_id = seed_cv(*_DATA_ANALYST)
+
+    search_id = _create_search(client, cv_id, keywords=["Data Analyst"])["search_id"]
+    _seed_results(search_id, 5)
+
+    page1 = client.get(f"/api/searches/{search_id}/results?page=1&page_size=2")
+    assert page1.status_code == 200
+    body1 = page1.json()
+    assert body1["total"] == 5
+    assert body1["page"] == 1
+    assert body1["page_size"] == 2
+    assert body1["total_pages"] == 3
+    assert body1["has_prev"] is False
+    assert body1["has_next"] is True
+    assert len(body1["items"]) == 2
+
+    page3 = client.get(f"/api/searches/{search_id}/results?page=3&page_size=2")
+    assert page3.status_code == 200
+    body3 = page3.json()
+    assert body3["total"] == 5
+    assert body3["page"] == 3
+    assert body3["page_size"] == 2
+    assert body3["total_pages"] == 3
+    assert body3["has_prev"] is True
+    assert body3["has_next"] is False
+    assert len(body3["items"]) == 1
+
+
+def test_scheduled_run_forces_one_hour_window(scraper, seed_cv):
+    cv_id = seed_cv(*_PUBLIC_ADMIN)
+    search_id = _seed_search(cv_id, time_window_hours=72, keywords_json=["administrador publico"])
 
-    seen_windows: list[int] = []
-
-    def fake_scrape_jobs(keywords, location, time_window_hours, **kwargs):
-        seen_windows.append(int(time_window_hours))
-        return []
-
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_scrape_jobs)
-
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 72,
-                "keywords": ["administrador publico"],
-            },
-        )
-        assert created.status_code == 200
-        search_id = created.json()["search_id"]
-
-    seen_windows.clear()
     run_search_once(SessionLocal, search_id, run_type="scheduled")
 
-    assert seen_windows
-    assert set(seen_windows) == {1}
+    assert scraper.call_args_list
+    assert {call.kwargs["time_window_hours"] for call in scraper.call_args_list} == {1}
 
 
-def test_excludes_jobs_with_100_or_more_applicants(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Data Analyst\nSkills: Python, SQL\nEducation: Bachelor",
-    )
+def test_failed_scheduled_run_is_logged_with_its_search(monkeypatch, caplog, seed_cv):
+    search_id = _seed_search(seed_cv(*_PUBLIC_ADMIN))
 
-    def fake_scrape_jobs(keywords, location, time_window_hours, **kwargs):
-        return [
-            {
-                "source": "linkedin_public",
-                "external_job_id": "101",
-                "canonical_url": "https://www.linkedin.com/jobs/view/101",
-                "canonical_url_hash": "h101",
-                "title": "Senior Data Analyst",
-                "company": "Acme",
-                "location": "Santiago",
-                "description": "Python SQL analytics",
-                "modality": "hybrid",
-                "easy_apply": True,
-                "applicant_count": 100,
-                "applicant_count_raw": "100 applicants",
-                "posted_at": None,
-            },
-            {
-                "source": "linkedin_public",
-                "external_job_id": "102",
-                "canonical_url": "https://www.linkedin.com/jobs/view/102",
-                "canonical_url_hash": "h102",
-                "title": "Data Analyst",
-                "company": "Acme",
-                "location": "Santiago",
-                "description": "Python SQL analyst role",
-                "modality": "hybrid",
-                "easy_apply": True,
-                "applicant_count": 99,
-                "applicant_count_raw": "99 applicants",
-                "posted_at": None,
-            },
-        ]
+    def locked_run(*_args):
+        raise RuntimeError("database is locked")
 
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_scrape_jobs)
+    monkeypatch.setattr("app.services.search_service.run_search_once", locked_run)
 
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["Data Analyst"],
-            },
-        )
-        assert created.status_code == 200
-        items = created.json()["results"]["items"]
-        assert len(items) == 1
-        assert items[0]["applicant_count"] == 99
+    assert run_all_active_searches(SessionLocal) == []
+    assert search_id in caplog.text
 
 
-def test_llm_fit_fallback_uses_match_percent_when_zero(monkeypatch):
-    monkeypatch.setattr(
-        "app.services.cv_extract._extract_pdf",
-        lambda _: "Data Analyst\nSkills: Python, SQL\nEducation: Bachelor",
-    )
+def test_excludes_jobs_with_100_or_more_applicants(client, scraper, seed_cv):
+    scraper.return_value = _JOBS_AROUND_APPLICANT_CAP
 
-    def fake_scrape_jobs(keywords, location, time_window_hours, **kwargs):
-        return [
-            {
-                "source": "linkedin_public",
-                "external_job_id": "201",
-                "canonical_url": "https://www.linkedin.com/jobs/view/201",
-                "canonical_url_hash": "h201",
-                "title": "Data Analyst",
-                "company": "Acme",
-                "location": "Santiago",
-                "description": "Python SQL analyst role",
-                "modality": "hybrid",
-                "easy_apply": True,
-                "applicant_count": 20,
-                "applicant_count_raw": "20 applicants",
-                "posted_at": None,
-            }
-        ]
+    cv_id = seed_cv(*_DATA_ANALYST)
+    items = _create_search(client, cv_id, keywords=["Data Analyst"])["results"]["items"]
+    assert len(items) == 1
+    assert items[0]["applicant_count"] == 99
 
+
+def test_llm_fit_fallback_uses_match_percent_when_zero(monkeypatch, client, scraper, seed_cv):
     def fake_evaluate_job_fit(*args, **kwargs):
         return {
             "job_category": "General",
@@ -659,23 +432,24 @@ def test_llm_fit_fallback_uses_match_percent_when_zero(monkeypatch):
             "llm_error": "forced fallback",
         }
 
-    monkeypatch.setattr("app.services.search_service.scrape_jobs", fake_scrape_jobs)
+    scraper.return_value = [_JOB_DATA_ANALYST]
     monkeypatch.setattr("app.services.search_service.evaluate_job_fit", fake_evaluate_job_fit)
 
-    with TestClient(app) as client:
-        files = {"file": ("cv.pdf", BytesIO(b"dummy"), "application/pdf")}
-        cv_id = client.post("/api/cv/upload", files=files).json()["cv_id"]
-        created = client.post(
-            "/api/searches",
-            json={
-                "cv_id": cv_id,
-                "country": "Chile",
-                "city": "Santiago",
-                "time_window_hours": 24,
-                "keywords": ["Data Analyst"],
-            },
-        )
-        assert created.status_code == 200
-        item = created.json()["results"]["items"][0]
-        assert item["match_percent"] > 0
-        assert item["llm_fit_score"] == item["match_percent"]
+    cv_id = seed_cv(*_DATA_ANALYST)
+    item = _create_search(client, cv_id, keywords=["Data Analyst"])["results"]["items"][0]
+    assert item["match_percent"] > 0
+    assert item["llm_fit_score"] == item["match_percent"]
+
+
+def test_cached_match_breakdowns_are_not_shared():
+    job = ({"title": "Data Analyst", "description": "Python SQL"}, f"hash-{uuid4()}")
+    profile_hash = f"profile-{uuid4()}"
+    summary = _DATA_ANALYST[1]
+
+    (_, first), = _cached_matches(profile_hash, summary, [job])
+    first["matched_skills"].append("tampered")
+    first["skills"] = -1.0
+
+    (_, second), = _cached_matches(profile_hash, summary, [job])
+    assert "tampered" not in second["matched_skills"]
+    assert second["skills"] >= 0
@@ -0,0 +1,101 @@
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from app import models
+from app.services.session_service import (
+    close_session,
+    create_session,
+    delete_session_group,
+    get_current_session,
+    purge_database_except_active_session,
+    resume_session,
+    update_session_state,
+)
+
+
+def _seed_session(db) -> str:
+    cv = models.CVDocument(filename="cv.pdf", file_hash=uuid4().hex, raw_text="Jane Doe")
+    db.add(cv)
+    db.flush()
+    session = create_session(db, cv_id=cv.id)
+    db.commit()
+    session_id = session.id
+    db.expunge_all()
+    return session_id
+
+
+def _cv_id(db, session_id: str) -> str:
+    return db.scalar(select(models.CVSession.cv_id).where(models.CVSession.id == session_id))
+
+
+def test_state_mutators_emit_one_select_and_no_refresh(strict_db, assert_max_queries):
+    session_id = _seed_session(strict_db)
+
+    with assert_max_queries(2):
+        session = update_session_state(strict_db, session_id=session_id, ui_state_json={"city": "Santiago"})
+        assert session.ui_state_json == {"city": "Santiago"}
+    strict_db.expunge_all()
+
+    # last_seen_at is fresh, so the read does not write it back.
+    with assert_max_queries(1):
+        session = get_current_session(strict_db, session_id=session_id)
+        assert session.id == session_id
+        # raiseload("*") would fail here if the CV were not joined in.
+        assert session.cv.filename == "cv.pdf"
+    strict_db.expunge_all()
+
+    with assert_max_queries(3):
+        session = resume_session(strict_db, session_id=session_id)
+        assert session.status == "active"
+    strict_db.expunge_all()
+
+    with assert_max_queries(2):
+        session = close_session(strict_db, session_id=session_id)
+        assert session.status == "closed"
+
+
+def test_resumed_session_is_the_most_recently_seen(strict_db):
+    resumed_id = _seed_session(strict_db)
+    other_id = _seed_session(strict_db)
+
+    # Inside the touch throttle window: explicit mutators still stamp last_seen_at.
+    resume_session(strict_db, session_id=resumed_id)
+
+    last_seen = dict(strict_db.execute(select(models.CVSession.id, models.CVSession.last_seen_at)).all())
+    assert last_seen[resumed_id] >= last_seen[other_id]
+
+
+def test_purge_statement_budget(strict_db, assert_max_queries):
+    _seed_session(strict_db)
+    keep_session_id = _seed_session(strict_db)
+
+    with assert_max_queries(8):
+        stats = purge_database_except_active_session(strict_db, keep_session_id=keep_session_id)
+
+    assert stats["kept_session_id"] == keep_session_id
+    assert stats["deleted_cv_documents"] >= 1
+
+
+def test_purge_removes_usage_logs_of_other_cvs(strict_db):
+    other_cv_id = _cv_id(strict_db, _seed_session(strict_db))
+    keep_session_id = _seed_session(strict_db)
+    kept_cv_id = _cv_id(strict_db, keep_session_id)
+    strict_db.add_all(
+        models.LLMUsageLog(cv_id=cv_id, feature="profile", model_name="gpt-5-mini")
+        for cv_id in (other_cv_id, kept_cv_id, None)
+    )
+    strict_db.commit()
+
+    stats = purge_database_except_active_session(strict_db, keep_session_id=keep_session_id)
+
+    assert stats["deleted_llm_usage_logs"] == 2
+    assert strict_db.scalars(select(models.LLMUsageLog.cv_id)).all() == [kept_cv_id]
+
+
+def test_delete_session_group_is_one_statement(strict_db, assert_max_queries):
+    session_id = _seed_session(strict_db)
+
+    with assert_max_queries(1):
+        assert delete_session_group(strict_db, session_id=session_id) is True
+    assert delete_session_group(strict_db, session_id=session_id) is False